@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List, Optional
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
 
 try:
     from firebase_admin import firestore
@@ -45,30 +51,55 @@ DEFAULT_QUESTIONS = [
 ]
 
 
-def _extract_json(text: str) -> Dict[str, Any]:
-    try:
-        return json.loads(text)
-    except Exception:
-        pass
-    import re
+_JSON_RE = re.compile(r"\{[\s\S]*\}")
+
+
+def _loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
-    match = re.search(r"\{[\s\S]*\}", text)
+def _extract_json(text: str) -> Dict[str, Any]:
+    stripped = text.lstrip()
+    if stripped.startswith(("{", "[")):
+        try:
+            return _loads(stripped)
+        except Exception:
+            pass
+
+    match = _JSON_RE.search(text)
     if not match:
         return {}
     try:
-        return json.loads(match.group(0))
+        return _loads(match.group(0))
     except Exception:
         return {}
 
 
+def _stable_prefix(brand: str, product: str, objective: str) -> str:
+    """Byte-identical context block shared by every prompt in one briefing.
+
+    Keeping it verbatim at the head of each call lets provider-side
+    prompt caching reuse the static prefix across rounds; everything
+    variable (questions, answers, round index) comes strictly after.
+    """
+    return f"【品牌背景】\n品牌: {brand}\n產品: {product}\n目標: {objective}\n\n"
+
+
+def _stable_answers(answers: Dict[str, str]) -> str:
+    return json.dumps(answers, ensure_ascii=False, sort_keys=True)
+
+
 def generate_questions(client: LLMClient, brand: str, product: str, objective: str, round_index: int) -> List[Dict[str, Any]]:
     if client.dry_run or client.settings.llm_provider.lower() == "mock":
         return DEFAULT_QUESTIONS
 
     prompt = (
-        "請根據以下品牌/產品資訊，產出一組行銷分析所需的提問清單（JSON）。\n"
+        _stable_prefix(brand, product, objective)
+        + "請根據以上品牌/產品資訊，產出一組行銷分析所需的提問清單（JSON）。\n"
         "JSON 格式：{questions:[{question,purpose,priority}]}\n\n"
-        f"品牌: {brand}\n產品: {product}\n目標: {objective}\n回合: {round_index}\n"
+        f"回合: {round_index}\n"
     )
     raw = client._call_llm("你是行銷策略助理，輸出必須是 JSON。", prompt)
     if "error" in raw or not raw:
@@ -81,9 +112,9 @@ def answer_questions_auto(client: LLMClient, brand: str, product: str, objective
         return {q.get("question", "Q"): "（自動假設）待補充" for q in questions}
 
     prompt = (
-        "請以品牌行銷分析師的角度，為下列問題提供合理假設回答。"
+        _stable_prefix(brand, product, objective)
+        + "請以品牌行銷分析師的角度，為下列問題提供合理假設回答。"
         "請以 JSON 回傳：{answers:{question:answer}}\n\n"
-        f"品牌: {brand}\n產品: {product}\n目標: {objective}\n"
         f"問題: {[q.get('question') for q in questions]}"
     )
     raw = client._call_llm("你是行銷分析師，輸出必須是 JSON。", prompt)
@@ -99,7 +130,7 @@ def evaluate_sufficiency(client: LLMClient, answers: Dict[str, str]) -> Dict[str
     prompt = (
         "請判斷下列回答是否足以產出行銷分析報告。"
         "輸出 JSON：{sufficient:boolean, missing_info:[...], follow_up_questions:[...]}\n\n"
-        f"回答: {answers}"
+        f"回答: {_stable_answers(answers)}"
     )
     raw = client._call_llm("你是行銷資料審查者，輸出必須是 JSON。", prompt)
     if "error" in raw or not raw:
@@ -131,10 +162,10 @@ def generate_report(
         }
 
     prompt = (
-        "請根據以下資訊產出完整行銷分析報告，輸出 JSON。\n"
+        _stable_prefix(brand, product, objective)
+        + "請根據以上資訊產出完整行銷分析報告，輸出 JSON。\n"
         "JSON 結構: {brand_core_message, ta_situation[], hot_topics[], creative_concepts:{A[],B[],C[]}, data_collection_strategy:{platforms[], keywords[], queries[]}}\n\n"
-        f"品牌: {brand}\n產品: {product}\n目標: {objective}\n"
-        f"回答: {answers}\n"
+        f"回答: {_stable_answers(answers)}\n"
     )
     raw = client._call_llm("你是行銷策略師，輸出必須是 JSON。", prompt)
     if "error" in raw or not raw:
@@ -147,6 +178,10 @@ def save_brief_to_firestore(settings: Settings, payload: Dict[str, Any]) -> None
     db.collection("marketing_briefs").add(payload)
 
 
+def _prompt_answer(question: str) -> str:
+    return input(f"{question}\n> ")
+
+
 def run_briefing(
     settings: Settings,
     brand: str,
@@ -156,8 +191,10 @@ def run_briefing(
     max_rounds: int = 2,
     dry_run: bool = False,
     save_firestore: bool = True,
+    answer_provider: Optional[Callable[[str], str]] = None,
 ) -> Dict[str, Any]:
     client = LLMClient(settings, dry_run=dry_run)
+    ask = answer_provider or _prompt_answer
 
     answers: Dict[str, str] = {}
     for round_idx in range(1, max_rounds + 1):
@@ -170,7 +207,7 @@ def run_briefing(
                 q_text = q.get("question", "")
                 if not q_text:
                     continue
-                user_answer = input(f"{q_text}\n> ").strip()
+                user_answer = (ask(q_text) or "").strip()
                 if user_answer:
                     answers[q_text] = user_answer
 
@@ -183,7 +220,7 @@ def run_briefing(
                 if mode == "auto":
                     answers[q_text] = "（自動補充）"
                 else:
-                    user_answer = input(f"{q_text}\n> ").strip()
+                    user_answer = (ask(q_text) or "").strip()
                     if user_answer:
                         answers[q_text] = user_answer
 
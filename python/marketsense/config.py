@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import os
 from typing import Optional
 
@@ -12,6 +12,9 @@ DEFAULT_USER_AGENT = (
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
+_TRUE_SET = frozenset({"1", "true", "yes", "y"})
+_FALSE_SET = frozenset({"0", "false", "no", "n"})
+
 
 def _env_int(key: str, default: int) -> int:
     value = os.getenv(key)
@@ -38,18 +41,18 @@ def _env_bool(key: str, default: bool) -> bool:
     if value is None or value == "":
         return default
     value = value.strip().lower()
-    if value in {"1", "true", "yes", "y"}:
+    if value in _TRUE_SET:
         return True
-    if value in {"0", "false", "no", "n"}:
+    if value in _FALSE_SET:
         return False
     return default
 
 
-def _env_list(key: str) -> list:
+def _env_set(key: str) -> frozenset:
     value = os.getenv(key, "")
     if not value:
-        return []
-    return [item.strip().lower() for item in value.split(",") if item.strip()]
+        return frozenset()
+    return frozenset(item.strip().lower() for item in value.split(",") if item.strip())
 
 
 def load_env(env_file: Optional[str]) -> None:
@@ -57,7 +60,7 @@ def load_env(env_file: Optional[str]) -> None:
         load_dotenv(env_file, override=False)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Settings:
     firebase_service_account: str
     firebase_storage_bucket: str
@@ -77,8 +80,9 @@ class Settings:
     local_store_only: bool
     max_text_chars: int
     llm_provider: str
-    allow_domains: list
-    deny_domains: list
+    # Frozensets so per-URL membership checks in is_domain_allowed are O(1)
+    allow_domains: frozenset
+    deny_domains: frozenset
     robots_enabled: bool
     robots_user_agent: str
     robots_cache_ttl: int
@@ -130,8 +134,8 @@ class Settings:
             ollama_model=os.getenv("OLLAMA_MODEL", "llama3.1"),
             ollama_api_mode=os.getenv("OLLAMA_API_MODE", "openai"),
             llm_timeout=_env_int("LLM_TIMEOUT", 60),
-            allow_domains=_env_list("ALLOW_DOMAINS"),
-            deny_domains=_env_list("DENY_DOMAINS"),
+            allow_domains=_env_set("ALLOW_DOMAINS"),
+            deny_domains=_env_set("DENY_DOMAINS"),
             robots_enabled=_env_bool("ROBOTS_ENABLED", True),
             robots_user_agent=os.getenv("ROBOTS_USER_AGENT", "MarketSenseBot"),
             robots_cache_ttl=_env_int("ROBOTS_CACHE_TTL", 3600),
@@ -153,41 +157,12 @@ class Settings:
         headless: Optional[bool] = None,
         user_agent: Optional[str] = None,
     ) -> "Settings":
-        return Settings(
-            firebase_service_account=self.firebase_service_account,
-            firebase_storage_bucket=self.firebase_storage_bucket,
-            max_concurrent=max_concurrent if max_concurrent is not None else self.max_concurrent,
-            min_delay=min_delay if min_delay is not None else self.min_delay,
-            max_delay=max_delay if max_delay is not None else self.max_delay,
-            cooldown_min=self.cooldown_min,
-            cooldown_max=self.cooldown_max,
-            retries=retries if retries is not None else self.retries,
-            retry_backoff_base=self.retry_backoff_base,
-            retry_backoff_max=self.retry_backoff_max,
-            headless=headless if headless is not None else self.headless,
-            user_agent=user_agent if user_agent is not None else self.user_agent,
-            page_timeout_ms=self.page_timeout_ms,
-            raw_html_prefix=self.raw_html_prefix,
-            local_raw_dir=self.local_raw_dir,
-            local_store_only=self.local_store_only,
-            max_text_chars=self.max_text_chars,
-            llm_provider=self.llm_provider,
-            ollama_api_key=self.ollama_api_key,
-            ollama_api_key_header=self.ollama_api_key_header,
-            ollama_base_url=self.ollama_base_url,
-            ollama_model=self.ollama_model,
-            ollama_api_mode=self.ollama_api_mode,
-            llm_timeout=self.llm_timeout,
-            allow_domains=self.allow_domains,
-            deny_domains=self.deny_domains,
-            robots_enabled=self.robots_enabled,
-            robots_user_agent=self.robots_user_agent,
-            robots_cache_ttl=self.robots_cache_ttl,
-            robots_fail_open=self.robots_fail_open,
-            domain_delay_base=self.domain_delay_base,
-            domain_delay_max=self.domain_delay_max,
-            running_stale_seconds=self.running_stale_seconds,
-            requeue_analyzed_after_hours=self.requeue_analyzed_after_hours,
-            requeue_downloaded_after_hours=self.requeue_downloaded_after_hours,
-            requeue_error_after_hours=self.requeue_error_after_hours,
-        )
+        overrides = {
+            "max_concurrent": max_concurrent,
+            "min_delay": min_delay,
+            "max_delay": max_delay,
+            "retries": retries,
+            "headless": headless,
+            "user_agent": user_agent,
+        }
+        return replace(self, **{key: value for key, value in overrides.items() if value is not None})
@@ -8,9 +8,15 @@ from __future__ import annotations
 import asyncio
 import json
 import random
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import List, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
 from playwright.async_api import async_playwright, BrowserContext, Page
 
 from .human_behavior import (
@@ -22,6 +28,72 @@ from .human_behavior import (
 )
 
 
+# 抽取只用到 h1/h2/p/a 文字，圖片、字型、樣式與追蹤腳本全是白流量
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+_BLOCKED_URL_HINTS = ("googletagmanager", "google-analytics", "facebook.net", "doubleclick")
+
+
+async def _block_nonessential(route):
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or any(
+        hint in request.url for hint in _BLOCKED_URL_HINTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class _PagePool:
+    """
+    頁面池：重複使用已暖機的分頁
+    省去每次呼叫的 new_page/close 與 warm_up 開銷
+    """
+
+    def __init__(self, context: BrowserContext, max_pages: int = 4):
+        self._context = context
+        self._max_pages = max_pages
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._lock = asyncio.Lock()
+
+    async def _checkout(self) -> Page:
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        async with self._lock:
+            if self._created < self._max_pages:
+                self._created += 1
+                page = await self._context.new_page()
+                await HumanBehaviorSimulator(page).warm_up()
+                return page
+        return await self._queue.get()
+
+    @asynccontextmanager
+    async def acquire(self):
+        page = await self._checkout()
+        try:
+            yield page
+        finally:
+            try:
+                await page.goto("about:blank")
+                self._queue.put_nowait(page)
+            except Exception:
+                # 頁面已壞掉就丟棄，之後 acquire 會補建新頁
+                async with self._lock:
+                    self._created -= 1
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        while not self._queue.empty():
+            page = self._queue.get_nowait()
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
 class DcardCrawler:
     """
     Dcard 專用爬蟲
@@ -30,16 +102,38 @@ class DcardCrawler:
 
     AUTH_STATE_PATH = Path(__file__).parent.parent.parent / "dcard-auth.json"
 
+    # 抽取函式透過 add_init_script 預先安裝在每個頁面上，
+    # 讓 selector 編譯與函式解析只發生一次，不佔每次呼叫的熱路徑
+    _EXTRACTOR_INIT_JS = """
+    window.__dcardExtractList = (n) =>
+        Array.from(document.querySelectorAll('article')).slice(0, n).map(a => ({
+            title: a.querySelector('h2')?.innerText ?? '',
+            link: a.querySelector('a[href*="/p/"]')?.getAttribute('href') ?? '',
+            board: a.querySelector('a[href^="/f/"]')?.innerText ?? '',
+            summary: (a.querySelector('p')?.innerText ?? '').slice(0, 200),
+        }));
+    window.__dcardExtractPost = () => ({
+        title: document.querySelector('h1')?.innerText ?? '',
+        content: document.querySelector('article')?.innerText ?? '',
+        author: document.querySelector('a[href^="/@"]')?.innerText ?? '',
+    });
+    """
+    _LIST_EXTRACT_JS = "(n) => window.__dcardExtractList(n)"
+
     def __init__(
         self,
         headless: bool = True,
         auth_state_path: Optional[str] = None,
+        stealth: bool = False,
     ):
         self.headless = headless
         self.auth_state_path = Path(auth_state_path) if auth_state_path else self.AUTH_STATE_PATH
+        # stealth=True 時在抓文前模擬閱讀/捲動，較慢但更像真人
+        self.stealth = stealth
         self._browser = None
         self._context: Optional[BrowserContext] = None
         self._playwright = None
+        self._pool: Optional[_PagePool] = None
 
     async def __aenter__(self):
         await self.start()
@@ -65,9 +159,14 @@ class DcardCrawler:
             print("   請先執行登入並儲存狀態")
 
         self._context = await self._browser.new_context(**context_options)
+        await self._context.add_init_script(script=self._EXTRACTOR_INIT_JS)
+        await self._context.route("**/*", _block_nonessential)
+        self._pool = _PagePool(self._context)
 
     async def close(self) -> None:
         """關閉瀏覽器"""
+        if self._pool:
+            await self._pool.close()
         if self._context:
             await self._context.close()
         if self._browser:
@@ -80,7 +179,10 @@ class DcardCrawler:
         save_path = Path(path) if path else self.auth_state_path
         if self._context:
             state = await self._context.storage_state()
-            save_path.write_text(json.dumps(state, ensure_ascii=False, indent=2))
+            if orjson is not None:
+                save_path.write_bytes(orjson.dumps(state, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                save_path.write_text(json.dumps(state, ensure_ascii=False, indent=2))
             print(f"✅ 已儲存認證狀態: {save_path}")
 
     async def fetch_forum_posts(
@@ -103,72 +205,97 @@ class DcardCrawler:
         if not self._context:
             raise RuntimeError("Crawler not started. Call start() first.")
 
-        page = await self._context.new_page()
-        human_sim = HumanBehaviorSimulator(page)
-        await human_sim.warm_up()
+        # 先走官方 JSON API：同一份資料、免渲染免捲動
+        api_posts = await self._fetch_forum_posts_api(forum, count, sort)
+        if api_posts is not None:
+            return api_posts
 
         posts = []
-        try:
-            url = f"https://www.dcard.tw/f/{forum}"
-            if sort == "new":
-                url += "?tab=latest"
-
-            # 模擬人類導航
-            await simulate_mouse_movement(page, 0.5)
-            await page.goto(url, wait_until="domcontentloaded")
-            await simulate_reading_pause(1.0, 2.0)
-
-            # 捲動載入更多文章
-            loaded_count = 0
-            scroll_attempts = 0
-            max_scrolls = count // 5 + 3
-
-            while loaded_count < count and scroll_attempts < max_scrolls:
-                await simulate_scroll(page, 2)
-                await simulate_reading_pause(0.8, 1.5)
-
-                # 透過 API 獲取文章資料
-                articles = await page.query_selector_all('article')
-                loaded_count = len(articles)
-                scroll_attempts += 1
-
-            # 提取文章資訊
-            articles = await page.query_selector_all('article')
-            for i, article in enumerate(articles[:count]):
-                try:
-                    # 取得標題
-                    title_el = await article.query_selector('h2')
-                    title = await title_el.inner_text() if title_el else ""
-
-                    # 取得連結
-                    link_el = await article.query_selector('a[href*="/p/"]')
-                    link = await link_el.get_attribute('href') if link_el else ""
-
-                    # 取得看板
-                    board_el = await article.query_selector('a[href^="/f/"]')
-                    board = await board_el.inner_text() if board_el else forum
-
-                    # 取得摘要
-                    summary_el = await article.query_selector('p')
-                    summary = await summary_el.inner_text() if summary_el else ""
-
+        async with self._pool.acquire() as page:
+            try:
+                url = f"https://www.dcard.tw/f/{forum}"
+                if sort == "new":
+                    url += "?tab=latest"
+
+                # 模擬人類導航
+                await simulate_mouse_movement(page, 0.5)
+                await page.goto(url, wait_until="domcontentloaded")
+                await simulate_reading_pause(1.0, 2.0)
+
+                # 捲動載入更多文章
+                loaded_count = 0
+                scroll_attempts = 0
+                max_scrolls = count // 5 + 3
+
+                while loaded_count < count and scroll_attempts < max_scrolls:
+                    await simulate_scroll(page, 2)
+                    await simulate_reading_pause(0.8, 1.5)
+
+                    # 透過 API 獲取文章資料
+                    articles = await page.query_selector_all('article')
+                    loaded_count = len(articles)
+                    scroll_attempts += 1
+
+                # 提取文章資訊（單次 evaluate 在頁面內完成所有欄位抽取）
+                raw_posts = await page.evaluate(self._LIST_EXTRACT_JS, count)
+                for i, item in enumerate(raw_posts):
+                    link = item.get("link", "")
                     posts.append({
                         "index": i + 1,
-                        "title": title.strip(),
+                        "title": item.get("title", "").strip(),
                         "link": f"https://www.dcard.tw{link}" if link and not link.startswith('http') else link,
-                        "board": board.strip(),
-                        "summary": summary.strip()[:200],
+                        "board": item.get("board", "").strip() or forum,
+                        "summary": item.get("summary", "").strip(),
                     })
-                except Exception as e:
-                    print(f"  ⚠️ 文章 {i+1} 解析失敗: {e}")
 
-            print(f"✅ 成功抓取 {len(posts)} 篇文章")
+                print(f"✅ 成功抓取 {len(posts)} 篇文章")
 
+            except Exception as e:
+                print(f"❌ 抓取失敗: {e}")
+
+        return posts
+
+    async def _fetch_forum_posts_api(
+        self,
+        forum: str,
+        count: int,
+        sort: str,
+    ) -> Optional[List[dict]]:
+        """
+        透過 Dcard JSON API 抓取看板文章列表
+
+        APIRequestContext 會沿用 context 的認證 cookies，
+        跳過整個 SPA 渲染與捲動流程。失敗時回傳 None 交回 HTML 路徑。
+        """
+        try:
+            resp = await self._context.request.get(
+                f"https://www.dcard.tw/service/api/v2/forums/{forum}/posts",
+                params={"popular": str(sort == "popular").lower(), "limit": count},
+            )
+            if resp.status != 200:
+                print(f"⚠️ Dcard API 回應 {resp.status}，改走 HTML 路徑")
+                return None
+            data = await resp.json()
         except Exception as e:
-            print(f"❌ 抓取失敗: {e}")
-        finally:
-            await page.close()
+            print(f"⚠️ Dcard API 失敗（{e}），改走 HTML 路徑")
+            return None
 
+        # 200 也可能回傳錯誤物件（dict）而非文章列表，照樣交回 HTML 路徑
+        if not isinstance(data, list):
+            print("⚠️ Dcard API 回傳非列表內容，改走 HTML 路徑")
+            return None
+
+        posts = []
+        for i, item in enumerate(data[:count]):
+            post_id = item.get("id", "")
+            posts.append({
+                "index": i + 1,
+                "title": (item.get("title") or "").strip(),
+                "link": f"https://www.dcard.tw/f/{forum}/p/{post_id}" if post_id else "",
+                "board": item.get("forumAlias") or forum,
+                "summary": (item.get("excerpt") or "").strip()[:200],
+            })
+        print(f"✅ 透過 API 抓取 {len(posts)} 篇文章")
         return posts
 
     async def fetch_post_content(self, post_url: str) -> dict:
@@ -184,10 +311,6 @@ class DcardCrawler:
         if not self._context:
             raise RuntimeError("Crawler not started. Call start() first.")
 
-        page = await self._context.new_page()
-        human_sim = HumanBehaviorSimulator(page)
-        await human_sim.warm_up()
-
         result = {
             "url": post_url,
             "title": "",
@@ -198,43 +321,67 @@ class DcardCrawler:
             "comments_count": 0,
         }
 
-        try:
-            # 模擬人類導航
-            await simulate_mouse_movement(page, 0.5)
-            await page.goto(post_url, wait_until="domcontentloaded")
-            await simulate_reading_pause(1.5, 3.0)
+        async with self._pool.acquire() as page:
+            try:
+                await page.goto(post_url, wait_until="domcontentloaded")
 
-            # 模擬閱讀行為
-            await simulate_scroll(page, random.randint(2, 4))
-            await simulate_mouse_movement(page, 1.0)
+                if self.stealth:
+                    # 模擬閱讀行為（僅在需要擬真時付這筆時間）
+                    await simulate_reading_pause(1.5, 3.0)
+                    await simulate_scroll(page, random.randint(2, 4))
+                    await simulate_mouse_movement(page, 1.0)
 
-            # 等待內容載入
-            await page.wait_for_load_state("networkidle")
+                # 等到實際內容出現就繼續，不等 networkidle
+                # （Dcard 的 analytics/懶載入圖常讓 networkidle 拖到逾時）
+                await page.wait_for_selector('h1', state='attached', timeout=5000)
+                await page.wait_for_selector('article', state='attached', timeout=5000)
 
-            # 提取標題
-            title_el = await page.query_selector('h1')
-            if title_el:
-                result["title"] = await title_el.inner_text()
+                # 一次 evaluate 提取標題/內容/作者
+                extracted = await page.evaluate("() => window.__dcardExtractPost()")
+                result["title"] = extracted.get("title", "")
+                result["content"] = extracted.get("content", "")
+                result["author"] = extracted.get("author", "")
 
-            # 提取內容
-            content_el = await page.query_selector('article')
-            if content_el:
-                result["content"] = await content_el.inner_text()
+                print(f"✅ 成功抓取文章: {result['title'][:50]}...")
 
-            # 提取作者資訊
-            author_el = await page.query_selector('a[href^="/@"]')
-            if author_el:
-                result["author"] = await author_el.inner_text()
+            except Exception as e:
+                print(f"❌ 抓取文章失敗: {e}")
+                result["error"] = str(e)
 
-            print(f"✅ 成功抓取文章: {result['title'][:50]}...")
+        return result
 
-        except Exception as e:
-            print(f"❌ 抓取文章失敗: {e}")
-            result["error"] = str(e)
-        finally:
-            await page.close()
+    async def fetch_posts_batch(
+        self,
+        urls: List[str],
+        max_concurrency: int = 5,
+    ) -> List[dict]:
+        """
+        並行抓取多篇文章內容
 
-        return result
+        用 semaphore 限制同時進行的抓取數，避免觸發 Dcard 限流；
+        各任務向頁面池借頁，網路等待互相重疊。
+
+        Args:
+            urls: 文章網址列表
+            max_concurrency: 同時抓取的上限
+
+        Returns:
+            與 urls 順序對應的結果列表（失敗項為 {"url", "error"}）
+        """
+        if not self._context:
+            raise RuntimeError("Crawler not started. Call start() first.")
+
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def _one(url: str) -> dict:
+            async with sem:
+                return await self.fetch_post_content(url)
+
+        raw = await asyncio.gather(*[_one(u) for u in urls], return_exceptions=True)
+        return [
+            r if not isinstance(r, BaseException) else {"url": u, "error": str(r)}
+            for u, r in zip(urls, raw)
+        ]
 
     async def search_posts(
         self,
@@ -256,55 +403,39 @@ class DcardCrawler:
         if not self._context:
             raise RuntimeError("Crawler not started. Call start() first.")
 
-        page = await self._context.new_page()
-        human_sim = HumanBehaviorSimulator(page)
-        await human_sim.warm_up()
-
         results = []
-        try:
-            # 構建搜尋 URL
-            search_url = f"https://www.dcard.tw/search?query={keyword}"
-            if forum:
-                search_url += f"&forum={forum}"
-
-            # 模擬人類導航
-            await simulate_mouse_movement(page, 0.5)
-            await page.goto(search_url, wait_until="domcontentloaded")
-            await simulate_reading_pause(1.5, 2.5)
-
-            # 捲動載入更多結果
-            for _ in range(count // 10 + 2):
-                await simulate_scroll(page, 2)
-                await simulate_reading_pause(0.8, 1.5)
-
-            # 提取搜尋結果
-            articles = await page.query_selector_all('article')
-            for i, article in enumerate(articles[:count]):
-                try:
-                    title_el = await article.query_selector('h2')
-                    title = await title_el.inner_text() if title_el else ""
-
-                    link_el = await article.query_selector('a[href*="/p/"]')
-                    link = await link_el.get_attribute('href') if link_el else ""
-
-                    summary_el = await article.query_selector('p')
-                    summary = await summary_el.inner_text() if summary_el else ""
-
+        async with self._pool.acquire() as page:
+            try:
+                # 構建搜尋 URL
+                search_url = f"https://www.dcard.tw/search?query={keyword}"
+                if forum:
+                    search_url += f"&forum={forum}"
+
+                # 模擬人類導航
+                await simulate_mouse_movement(page, 0.5)
+                await page.goto(search_url, wait_until="domcontentloaded")
+                await simulate_reading_pause(1.5, 2.5)
+
+                # 捲動載入更多結果
+                for _ in range(count // 10 + 2):
+                    await simulate_scroll(page, 2)
+                    await simulate_reading_pause(0.8, 1.5)
+
+                # 提取搜尋結果（單次 evaluate 在頁面內完成所有欄位抽取）
+                raw_results = await page.evaluate(self._LIST_EXTRACT_JS, count)
+                for i, item in enumerate(raw_results):
+                    link = item.get("link", "")
                     results.append({
                         "index": i + 1,
-                        "title": title.strip(),
+                        "title": item.get("title", "").strip(),
                         "link": f"https://www.dcard.tw{link}" if link and not link.startswith('http') else link,
-                        "summary": summary.strip()[:200],
+                        "summary": item.get("summary", "").strip(),
                     })
-                except Exception as e:
-                    print(f"  ⚠️ 結果 {i+1} 解析失敗: {e}")
 
-            print(f"✅ 搜尋 '{keyword}' 找到 {len(results)} 篇文章")
+                print(f"✅ 搜尋 '{keyword}' 找到 {len(results)} 篇文章")
 
-        except Exception as e:
-            print(f"❌ 搜尋失敗: {e}")
-        finally:
-            await page.close()
+            except Exception as e:
+                print(f"❌ 搜尋失敗: {e}")
 
         return results
 
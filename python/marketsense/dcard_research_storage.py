@@ -4,22 +4,53 @@ Dcard Research Storage - 將 Dcard 內容研究資料存儲到 Firebase
 """
 
 from __future__ import annotations
+import asyncio
+import hashlib
+import json
 import os
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
 
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - fall back to md5
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
 try:
     import firebase_admin
-    from firebase_admin import credentials, firestore
+    from firebase_admin import credentials, firestore_async
     _FIREBASE_AVAILABLE = True
 except ImportError:
     firebase_admin = None
     credentials = None
-    firestore = None
+    firestore_async = None
     _FIREBASE_AVAILABLE = False
 
 
+def _article_id(title: str) -> str:
+    """由標題產生文件 ID；去重用途不需要密碼學強度的雜湊"""
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(title.encode())[:12]
+    return hashlib.md5(title.encode()).hexdigest()[:12]
+
+
+def _body_hash(payload: dict) -> str:
+    """對文件內容做穩定序列化後取雜湊，用來偵測無變更的寫入"""
+    if orjson is not None:
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode()
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(raw)
+    return hashlib.md5(raw).hexdigest()
+
+
 class DcardResearchStorage:
     """Dcard 內容研究資料存儲器"""
     
@@ -54,11 +85,11 @@ class DcardResearchStorage:
             cred = credentials.Certificate(service_account_path)
             firebase_admin.initialize_app(cred)
         
-        self.db = firestore.client()
+        self.db = firestore_async.client()
         self.collection_name = "dcard_research"
         self.campaign_id = "charging_world"  # 充電小世界活動
         
-    def save_keyword_research(self, keyword: str, data: dict) -> str:
+    async def save_keyword_research(self, keyword: str, data: dict) -> str:
         """
         儲存單一關鍵字的研究資料
         
@@ -70,27 +101,12 @@ class DcardResearchStorage:
             文件 ID
         """
         doc_ref = self.db.collection(self.collection_name).document(f"{self.campaign_id}_{keyword}")
-        
-        research_data = {
-            "keyword": keyword,
-            "campaign_id": self.campaign_id,
-            "campaign_name": "充電小世界",
-            "article_count": data.get("article_count", 0),
-            "followers": data.get("followers", 0),
-            "related_topics": data.get("related_topics", []),
-            "related_boards": data.get("related_boards", []),
-            "hot_articles": data.get("hot_articles", []),
-            "related_searches": data.get("related_searches", []),
-            "scraped_at": datetime.now(),
-            "source": "dcard",
-            "metadata": data.get("metadata", {})
-        }
-        
-        doc_ref.set(research_data, merge=True)
+        research_data = self._build_research_doc({**data, "keyword": keyword}, datetime.now())
+        await doc_ref.set(research_data, merge=True)
         print(f"✅ 已儲存關鍵字研究: {keyword}")
         return doc_ref.id
     
-    def save_all_research(self, research_results: list[dict]) -> dict:
+    async def save_all_research(self, research_results: list[dict]) -> dict:
         """
         批次儲存所有研究資料
         
@@ -100,44 +116,62 @@ class DcardResearchStorage:
         Returns:
             儲存結果統計
         """
-        batch = self.db.batch()
-        saved_count = 0
-        
+        now = datetime.now()
+        docs = []
         for result in research_results:
             keyword = result.get("keyword")
             if not keyword:
                 continue
-                
+
             doc_ref = self.db.collection(self.collection_name).document(f"{self.campaign_id}_{keyword}")
-            
-            research_data = {
-                "keyword": keyword,
-                "campaign_id": self.campaign_id,
-                "campaign_name": "充電小世界",
-                "article_count": result.get("article_count", 0),
-                "followers": result.get("followers", 0),
-                "related_topics": result.get("related_topics", []),
-                "related_boards": result.get("related_boards", []),
-                "hot_articles": result.get("hot_articles", []),
-                "related_searches": result.get("related_searches", []),
-                "scraped_at": datetime.now(),
-                "source": "dcard",
-                "metadata": result.get("metadata", {})
-            }
-            
+            research_data = self._build_research_doc(result, now)
+            # scraped_at 每次執行都變，不納入內容雜湊
+            research_data["body_hash"] = _body_hash(
+                {k: v for k, v in research_data.items() if k != "scraped_at"}
+            )
+            docs.append((doc_ref, research_data))
+
+        # 一次 get_all 撈回既有雜湊，內容沒變的文件連寫都不寫
+        existing_hashes = {}
+        try:
+            async for snap in self.db.get_all([ref for ref, _ in docs]):
+                if snap.exists:
+                    existing_hashes[snap.reference.path] = (snap.to_dict() or {}).get("body_hash")
+        except Exception as e:
+            print(f"⚠️ 讀取既有雜湊失敗（{e}），全部照常寫入")
+            existing_hashes = {}
+
+        batch = self.db.batch()
+        saved_count = 0
+        for doc_ref, research_data in docs:
+            if existing_hashes.get(doc_ref.path) == research_data["body_hash"]:
+                continue
             batch.set(doc_ref, research_data, merge=True)
             saved_count += 1
         
-        # 提交批次寫入
-        batch.commit()
-        
-        # 儲存研究摘要
-        self._save_research_summary(research_results)
+        # 批次提交與摘要寫入互相獨立，重疊進行
+        await asyncio.gather(batch.commit(), self._save_research_summary(research_results))
         
         print(f"✅ 批次儲存完成: {saved_count} 筆關鍵字研究")
         return {"saved_count": saved_count, "campaign_id": self.campaign_id}
     
-    def _save_research_summary(self, research_results: list[dict]):
+    def _build_research_doc(self, result: dict, now: datetime) -> dict:
+        return {
+            "keyword": result.get("keyword", ""),
+            "campaign_id": self.campaign_id,
+            "campaign_name": "充電小世界",
+            "article_count": result.get("article_count", 0),
+            "followers": result.get("followers", 0),
+            "related_topics": result.get("related_topics", []),
+            "related_boards": result.get("related_boards", []),
+            "hot_articles": result.get("hot_articles", []),
+            "related_searches": result.get("related_searches", []),
+            "scraped_at": now,
+            "source": "dcard",
+            "metadata": result.get("metadata", {})
+        }
+
+    async def _save_research_summary(self, research_results: list[dict]):
         """儲存研究摘要"""
         total_articles = sum(r.get("article_count", 0) for r in research_results)
         
@@ -154,10 +188,10 @@ class DcardResearchStorage:
         }
         
         doc_ref = self.db.collection(self.collection_name).document(f"{self.campaign_id}_summary")
-        doc_ref.set(summary, merge=True)
+        await doc_ref.set(summary, merge=True)
         print(f"✅ 已儲存研究摘要: 共 {total_articles:,} 篇文章")
     
-    def save_hot_article(self, article: dict) -> str:
+    async def save_hot_article(self, article: dict) -> str:
         """
         儲存高互動文章
         
@@ -168,14 +202,51 @@ class DcardResearchStorage:
             文件 ID
         """
         # 使用文章標題的 hash 作為 ID
-        import hashlib
         title = article.get("title", "")
-        article_id = hashlib.md5(title.encode()).hexdigest()[:12]
-        
+        article_id = _article_id(title)
+
         doc_ref = self.db.collection(f"{self.collection_name}_articles").document(article_id)
-        
-        article_data = {
-            "title": title,
+        await doc_ref.set(self._build_article_doc(article, datetime.now()), merge=True)
+        return doc_ref.id
+
+    async def save_hot_articles_batch(self, articles: list[dict]) -> list[str]:
+        """
+        批次儲存高互動文章
+
+        單一 WriteBatch 一次提交所有文章，取代逐篇 set 的一篇一 RPC；
+        超過 450 筆時分段提交（Firestore 單批上限 500）。
+
+        Args:
+            articles: 文章資料列表
+
+        Returns:
+            文件 ID 列表
+        """
+        batch = self.db.batch()
+        now = datetime.now()
+        ids = []
+        pending = 0
+
+        for article in articles:
+            title = article.get("title", "")
+            article_id = _article_id(title)
+            doc_ref = self.db.collection(f"{self.collection_name}_articles").document(article_id)
+
+            batch.set(doc_ref, self._build_article_doc(article, now), merge=True)
+            ids.append(article_id)
+            pending += 1
+            if pending >= 450:
+                await batch.commit()
+                batch = self.db.batch()
+                pending = 0
+
+        if pending:
+            await batch.commit()
+        return ids
+
+    def _build_article_doc(self, article: dict, now: datetime) -> dict:
+        return {
+            "title": article.get("title", ""),
             "board": article.get("board", ""),
             "reactions": article.get("reactions", 0),
             "comments": article.get("comments", 0),
@@ -185,34 +256,31 @@ class DcardResearchStorage:
             "posted_at": article.get("posted_at", ""),
             "keywords": article.get("keywords", []),
             "campaign_id": self.campaign_id,
-            "scraped_at": datetime.now(),
+            "scraped_at": now,
             "source": "dcard"
         }
-        
-        doc_ref.set(article_data, merge=True)
-        return doc_ref.id
-    
-    def get_research_by_keyword(self, keyword: str) -> Optional[dict]:
+
+    async def get_research_by_keyword(self, keyword: str) -> Optional[dict]:
         """取得特定關鍵字的研究資料"""
         doc_ref = self.db.collection(self.collection_name).document(f"{self.campaign_id}_{keyword}")
-        doc = doc_ref.get()
+        doc = await doc_ref.get()
         return doc.to_dict() if doc.exists else None
     
-    def get_all_research(self) -> list[dict]:
+    async def get_all_research(self) -> list[dict]:
         """取得所有研究資料"""
         docs = self.db.collection(self.collection_name).where(
             "campaign_id", "==", self.campaign_id
         ).stream()
-        return [doc.to_dict() for doc in docs]
+        return [doc.to_dict() async for doc in docs]
     
-    def get_research_summary(self) -> Optional[dict]:
+    async def get_research_summary(self) -> Optional[dict]:
         """取得研究摘要"""
         doc_ref = self.db.collection(self.collection_name).document(f"{self.campaign_id}_summary")
-        doc = doc_ref.get()
+        doc = await doc_ref.get()
         return doc.to_dict() if doc.exists else None
 
 
-def save_charging_world_research():
+async def save_charging_world_research():
     """
     儲存「充電小世界」活動的 Dcard 研究資料
     """
@@ -327,7 +395,7 @@ def save_charging_world_research():
     ]
     
     # 儲存到 Firebase
-    result = storage.save_all_research(research_results)
+    result = await storage.save_all_research(research_results)
     
     # 額外儲存高互動文章
     all_hot_articles = []
@@ -337,9 +405,8 @@ def save_charging_world_research():
             article["keywords"] = [keyword]
             all_hot_articles.append(article)
     
-    # 儲存熱門文章
-    for article in all_hot_articles:
-        storage.save_hot_article(article)
+    # 儲存熱門文章（單批提交，免去一篇一 RPC）
+    await storage.save_hot_articles_batch(all_hot_articles)
     
     print(f"\n🎉 儲存完成！")
     print(f"   - 關鍵字研究: {result['saved_count']} 筆")
@@ -349,4 +416,4 @@ def save_charging_world_research():
 
 
 if __name__ == "__main__":
-    save_charging_world_research()
+    asyncio.run(save_charging_world_research())
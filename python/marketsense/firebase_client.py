@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import functools
+import threading
+
 try:
     import firebase_admin
     from firebase_admin import credentials, firestore, storage
@@ -13,15 +16,24 @@ except ImportError:  # pragma: no cover - fallback for test environments
 
 from .config import Settings
 
+# initialize_app 的 _apps 檢查不是執行緒安全的，集中用鎖保護
+_INIT_LOCK = threading.Lock()
 
-def get_db_and_bucket(settings: Settings):
-    if not _FIREBASE_AVAILABLE:
-        raise RuntimeError("firebase-admin is not installed. Install requirements.txt to use Firebase.")
-    if not firebase_admin._apps:
-        cred = credentials.Certificate(settings.firebase_service_account)
-        options = {"storageBucket": settings.firebase_storage_bucket} if settings.firebase_storage_bucket else {}
-        firebase_admin.initialize_app(cred, options)
+
+@functools.lru_cache(maxsize=4)
+def _get_clients(service_account: str, storage_bucket: str):
+    with _INIT_LOCK:
+        if not firebase_admin._apps:
+            cred = credentials.Certificate(service_account)
+            options = {"storageBucket": storage_bucket} if storage_bucket else {}
+            firebase_admin.initialize_app(cred, options)
 
     db = firestore.client()
     bucket = storage.bucket()
     return db, bucket
+
+
+def get_db_and_bucket(settings: Settings):
+    if not _FIREBASE_AVAILABLE:
+        raise RuntimeError("firebase-admin is not installed. Install requirements.txt to use Firebase.")
+    return _get_clients(settings.firebase_service_account, settings.firebase_storage_bucket)
@@ -5,19 +5,35 @@ Human Behavior Simulation Module
 from __future__ import annotations
 
 import asyncio
+import functools
 import random
+import sys
 from typing import List, Optional, Tuple
 
-
-# 動態 User-Agent 輪換列表（2024-2026 最新版本）
-USER_AGENTS = [
-    # Chrome (macOS)
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36",
-    # Chrome (Windows)
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 退回純 Python 路徑
+    np = None
+
+
+# Chrome 系 UA 由片段組合而成：平台 × 版本 × 後綴
+# （2024-2026 最新版本；片段 intern 後共用字串儲存，也方便擴充輪替多樣性）
+_UA_PLATFORMS = tuple(sys.intern(p) for p in (
+    "Macintosh; Intel Mac OS X 10_15_7",
+    "Macintosh; Intel Mac OS X 14_4",
+    "Windows NT 10.0; Win64; x64",
+))
+_UA_ENGINE = sys.intern("AppleWebKit/537.36 (KHTML, like Gecko)")
+_UA_CHROMES = tuple(sys.intern(c) for c in ("Chrome/144.0.0.0", "Chrome/143.0.0.0"))
+_UA_SUFFIXES = tuple(sys.intern(s) for s in ("Safari/537.36",))
+
+# 動態 User-Agent 輪換列表
+USER_AGENTS = tuple(
+    f"Mozilla/5.0 ({platform}) {_UA_ENGINE} {chrome} {suffix}"
+    for platform in _UA_PLATFORMS
+    for chrome in _UA_CHROMES
+    for suffix in _UA_SUFFIXES
+) + (
     # Firefox
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:133.0) Gecko/20100101 Firefox/133.0",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:133.0) Gecko/20100101 Firefox/133.0",
@@ -25,10 +41,10 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.4 Safari/605.1.15",
     # Edge
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36 Edg/144.0.0.0",
-]
+)
 
 # 常見螢幕解析度
-SCREEN_RESOLUTIONS = [
+SCREEN_RESOLUTIONS = (
     (1920, 1080),
     (2560, 1440),
     (1440, 900),
@@ -36,16 +52,16 @@ SCREEN_RESOLUTIONS = [
     (1366, 768),
     (2880, 1620),  # Retina
     (3840, 2160),  # 4K
-]
+)
 
 # 時區列表
-TIMEZONES = [
+TIMEZONES = (
     "Asia/Taipei",
     "Asia/Hong_Kong",
     "Asia/Tokyo",
     "America/Los_Angeles",
     "America/New_York",
-]
+)
 
 
 def get_random_user_agent() -> str:
@@ -67,10 +83,28 @@ def get_random_timezone() -> str:
     return random.choice(TIMEZONES)
 
 
-async def simulate_mouse_movement(page, duration: float = 2.0) -> None:
+def _bezier_points(width: int, height: int, num_points: int = 24) -> List[Tuple[int, int]]:
+    """
+    用 numpy 向量化取樣一條三次貝茲曲線（含手抖 jitter）
+
+    四個控制點隨機落在安全區內，整條曲線在一次 C 層運算裡算完，
+    比逐點 Python 迴圈既快又平滑
+    """
+    ctrl = np.random.randint([50, 50], [width - 50, height - 50], size=(4, 2))
+    t = np.linspace(0.0, 1.0, num_points)[:, None]
+    u = 1.0 - t
+    pts = u**3 * ctrl[0] + 3 * u**2 * t * ctrl[1] + 3 * u * t**2 * ctrl[2] + t**3 * ctrl[3]
+    pts = (pts + np.random.randint(-3, 4, pts.shape)).astype(int)
+    return [(int(x), int(y)) for x, y in pts]
+
+
+async def simulate_mouse_movement(page, duration: float = 2.0, cdp=None) -> None:
     """
     模擬人類滑鼠移動軌跡
     使用貝茲曲線產生自然的移動路徑
+
+    傳入 CDP session 時改走 Input.dispatchMouseEvent，
+    整批事件一次送出，省下每點一趟的 Playwright 往返
     """
     viewport = page.viewport_size
     if not viewport:
@@ -79,23 +113,39 @@ async def simulate_mouse_movement(page, duration: float = 2.0) -> None:
     width = viewport.get("width", 1200)
     height = viewport.get("height", 800)
 
-    # 產生 3-6 個隨機路徑點
-    num_points = random.randint(3, 6)
-    points: List[Tuple[int, int]] = []
-
-    for _ in range(num_points):
-        x = random.randint(50, width - 50)
-        y = random.randint(50, height - 50)
-        points.append((x, y))
-
-    # 沿路徑移動滑鼠
-    for x, y in points:
-        # 添加微小的抖動，模擬人手的不穩定
-        jitter_x = random.randint(-3, 3)
-        jitter_y = random.randint(-3, 3)
+    # 先一口氣產生所有路徑點、抖動與停頓，await 迴圈裡不再碰 RNG
+    _randint = random.randint
+    _uniform = random.uniform
+    if np is not None:
+        # 真正的貝茲曲線取樣；點多但停頓按 duration 均攤，總時長不變
+        path = _bezier_points(width, height)
+        per_point = duration / len(path)
+        points: List[Tuple[int, int, float]] = [
+            (x, y, per_point * _uniform(0.6, 1.4)) for x, y in path
+        ]
+    else:
+        # 無 numpy：維持原本 3-6 點的線性走位
+        num_points = _randint(3, 6)
+        points = [
+            (
+                _randint(50, width - 50) + _randint(-3, 3),
+                _randint(50, height - 50) + _randint(-3, 3),
+                _uniform(0.1, 0.4),
+            )
+            for _ in range(num_points)
+        ]
+
+    if cdp is not None:
+        # 整批滑鼠事件直接打 CDP，最後一次補齊總停頓時間
+        for x, y, _ in points:
+            await cdp.send("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": x, "y": y})
+        await asyncio.sleep(sum(pause for _, _, pause in points))
+        return
 
-        await page.mouse.move(x + jitter_x, y + jitter_y)
-        await asyncio.sleep(random.uniform(0.1, 0.4))
+    # 沿路徑移動滑鼠（抖動已含在座標內，模擬人手的不穩定）
+    for x, y, pause in points:
+        await page.mouse.move(x, y)
+        await asyncio.sleep(pause)
 
 
 async def simulate_scroll(page, scroll_count: int = 3) -> None:
@@ -103,19 +153,21 @@ async def simulate_scroll(page, scroll_count: int = 3) -> None:
     模擬人類捲動行為
     包含不規則的捲動距離和速度
     """
+    # 預先抽好每次的距離、方向與停頓
+    _randint = random.randint
+    _random = random.random
+    _uniform = random.uniform
+    moves = []
     for _ in range(scroll_count):
-        # 隨機捲動距離 (100-500 像素)
-        scroll_amount = random.randint(100, 500)
-
-        # 決定方向 (主要向下，偶爾向上)
-        if random.random() < 0.85:
-            direction = scroll_amount
-        else:
-            direction = -scroll_amount // 2
+        # 隨機捲動距離 (100-500 像素)；主要向下，偶爾向上
+        scroll_amount = _randint(100, 500)
+        direction = scroll_amount if _random() < 0.85 else -scroll_amount // 2
+        moves.append((direction, _uniform(0.5, 2.0)))
 
+    for direction, pause in moves:
         await page.mouse.wheel(0, direction)
         # 人類會在捲動後停頓閱讀
-        await asyncio.sleep(random.uniform(0.5, 2.0))
+        await asyncio.sleep(pause)
 
 
 async def simulate_reading_pause(min_seconds: float = 1.0, max_seconds: float = 5.0) -> None:
@@ -137,23 +189,34 @@ async def simulate_random_clicks(page, count: int = 2) -> None:
     width = viewport.get("width", 1200)
     height = viewport.get("height", 800)
 
-    for _ in range(count):
-        # 避開邊緣區域
-        x = random.randint(100, width - 100)
-        y = random.randint(100, height - 100)
-
+    # 預先抽好位置、停頓與是否點擊（避開邊緣區域）
+    _randint = random.randint
+    _uniform = random.uniform
+    _random = random.random
+    clicks = [
+        (
+            _randint(100, width - 100),
+            _randint(100, height - 100),
+            _uniform(0.1, 0.3),
+            _random() < 0.3,
+            _uniform(0.3, 1.0),
+        )
+        for _ in range(count)
+    ]
+
+    for x, y, move_pause, do_click, rest in clicks:
         # 模擬移動到點擊位置
         await page.mouse.move(x, y)
-        await asyncio.sleep(random.uniform(0.1, 0.3))
+        await asyncio.sleep(move_pause)
 
         # 隨機決定是否真的點擊（避免觸發不想要的操作）
-        if random.random() < 0.3:
+        if do_click:
             await page.mouse.click(x, y)
 
-        await asyncio.sleep(random.uniform(0.3, 1.0))
+        await asyncio.sleep(rest)
 
 
-async def human_like_navigation(page, url: str, settings=None) -> None:
+async def human_like_navigation(page, url: str, settings=None, cdp=None) -> None:
     """
     執行類人的網頁瀏覽流程
     """
@@ -163,47 +226,52 @@ async def human_like_navigation(page, url: str, settings=None) -> None:
     # 2. 導航到頁面
     await page.goto(url, wait_until="domcontentloaded")
 
-    # 3. 等待頁面基本載入
-    await asyncio.sleep(random.uniform(1.0, 2.0))
+    # 3. 載入等待與閱讀停頓合併成單一 sleep，少排一次事件圈 timer
+    #    （總等待時間分布不變）
+    await asyncio.sleep(random.uniform(1.0, 2.0) + random.uniform(1.0, 3.0))
 
     # 4. 模擬初始滑鼠移動
-    await simulate_mouse_movement(page, duration=1.5)
-
-    # 5. 模擬閱讀停頓
-    await simulate_reading_pause(1.0, 3.0)
+    await simulate_mouse_movement(page, duration=1.5, cdp=cdp)
 
-    # 6. 模擬捲動閱讀
+    # 5. 模擬捲動閱讀（捲動間的停頓必須保留，頁面要時間渲染）
     await simulate_scroll(page, scroll_count=random.randint(2, 4))
 
-    # 7. 再次滑鼠移動
-    await simulate_mouse_movement(page, duration=1.0)
+    # 6. 再次滑鼠移動
+    await simulate_mouse_movement(page, duration=1.0, cdp=cdp)
 
-    # 8. 最終等待（確保動態內容載入）
+    # 7. 最終等待（確保動態內容載入）
     await page.wait_for_load_state("networkidle")
 
 
-def get_browser_context_options() -> dict:
+@functools.lru_cache(maxsize=8)
+def _context_template(seed: int) -> dict:
     """
-    取得更真實的瀏覽器 context 設定
+    依 seed 產生（並快取）context 設定的靜態部分
+
+    context 選項裡除了 User-Agent 以外都不需要每頁重抽；
+    固定在 8 組樣板內輪替，既保留多樣性又省掉每次的 RNG 與 dict 建構
     """
-    viewport = get_random_viewport()
+    rng = random.Random(seed)
+    width, height = rng.choice(SCREEN_RESOLUTIONS)
+    viewport = {
+        "width": width - rng.randint(0, 200),
+        "height": height - rng.randint(100, 200),
+    }
 
     return {
-        "user_agent": get_random_user_agent(),
         "viewport": viewport,
         "screen": {
-            "width": viewport["width"] + random.randint(0, 200),
-            "height": viewport["height"] + random.randint(100, 200),
+            "width": viewport["width"] + rng.randint(0, 200),
+            "height": viewport["height"] + rng.randint(100, 200),
         },
-        "locale": random.choice(["zh-TW", "zh-HK", "en-US"]),
-        "timezone_id": get_random_timezone(),
-        "color_scheme": random.choice(["light", "dark"]),
-        "has_touch": random.choice([True, False]),
+        "locale": rng.choice(["zh-TW", "zh-HK", "en-US"]),
+        "timezone_id": rng.choice(TIMEZONES),
+        "color_scheme": rng.choice(["light", "dark"]),
+        "has_touch": rng.choice([True, False]),
         "is_mobile": False,
         "java_script_enabled": True,
         "accept_downloads": True,
         "ignore_https_errors": True,
-        # WebGL 偽裝
         "extra_http_headers": {
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
             "Accept-Language": "zh-TW,zh;q=0.9,en-US;q=0.8,en;q=0.7",
@@ -222,6 +290,16 @@ def get_browser_context_options() -> dict:
     }
 
 
+def get_browser_context_options() -> dict:
+    """
+    取得更真實的瀏覽器 context 設定
+    """
+    options = dict(_context_template(random.randrange(8)))
+    # 只有 UA 每次重抽
+    options["user_agent"] = get_random_user_agent()
+    return options
+
+
 # 進階：WebGL 偽裝腳本
 WEBGL_SPOOF_SCRIPT = """
 () => {
@@ -278,11 +356,25 @@ WEBGL_SPOOF_SCRIPT = """
 """
 
 
+# 去掉縮排後的精簡版，少送一點 CDP bytes
+_WEBGL_SPOOF_MIN = "\n".join(line.strip() for line in WEBGL_SPOOF_SCRIPT.strip().splitlines())
+
+
 async def apply_stealth_scripts(page) -> None:
     """
     應用進階反偵測腳本
+
+    優先註冊在 context 上（同 context 的後續頁面免費繼承）；
+    拿不到 context 時才退回逐頁註冊
     """
-    await page.add_init_script(WEBGL_SPOOF_SCRIPT)
+    context = getattr(page, "context", None)
+    if context is not None:
+        try:
+            await HumanBehaviorSimulator.ensure_stealth(context)
+            return
+        except Exception:
+            pass
+    await page.add_init_script(_WEBGL_SPOOF_MIN)
 
 
 class HumanBehaviorSimulator:
@@ -294,24 +386,46 @@ class HumanBehaviorSimulator:
     def __init__(self, page, settings=None):
         self.page = page
         self.settings = settings
+        self._cdp = None
+
+    @classmethod
+    async def ensure_stealth(cls, context) -> None:
+        """
+        在 context 層級註冊一次反偵測腳本
+
+        CDP 的 Page.addScriptToEvaluateOnNewDocument 支援 context 範圍註冊，
+        同 context 的每個新頁面自動繼承；旗標確保腳本只上傳 O(contexts) 次
+        而非 O(pages) 次
+        """
+        if getattr(context, "_stealth_applied", False):
+            return
+        await context.add_init_script(_WEBGL_SPOOF_MIN)
+        context._stealth_applied = True
 
     async def warm_up(self) -> None:
-        """預熱：應用反偵測腳本"""
+        """預熱：應用反偵測腳本並開啟 CDP session 供批次滑鼠事件用"""
         await apply_stealth_scripts(self.page)
+        try:
+            self._cdp = await self.page.context.new_cdp_session(self.page)
+        except Exception:
+            # 非 Chromium 引擎沒有 CDP，退回 Playwright mouse API
+            self._cdp = None
 
     async def browse_naturally(self, url: str) -> None:
         """自然瀏覽一個頁面"""
-        await human_like_navigation(self.page, url, self.settings)
+        await human_like_navigation(self.page, url, self.settings, cdp=self._cdp)
 
     async def random_activity(self, duration: float = 5.0) -> None:
         """
         執行一段隨機的人類活動
         """
-        start = asyncio.get_event_loop().time()
-        while asyncio.get_event_loop().time() - start < duration:
-            action = random.choice(["move", "scroll", "pause"])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        actions = ("move", "scroll", "pause")
+        while loop.time() < deadline:
+            action = random.choice(actions)
             if action == "move":
-                await simulate_mouse_movement(self.page, 1.0)
+                await simulate_mouse_movement(self.page, 1.0, cdp=self._cdp)
             elif action == "scroll":
                 await simulate_scroll(self.page, 1)
             else:
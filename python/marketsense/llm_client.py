@@ -1,26 +1,250 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import re
+import threading
 from typing import Any, Dict, Optional
 
 import requests
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - async path unavailable
+    httpx = None
+try:
+    from cachetools import TTLCache
+except ImportError:  # pragma: no cover - caching becomes a no-op
+    TTLCache = None
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
 
 from .config import Settings
 from .utils import extract_json, normalize_analysis
 
 
+CACHE_MAXSIZE = 10_000
+CACHE_TTL_SECONDS = 86_400
+
+POOL_SIZE = 50
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Lazily build one keep-alive session shared by every LLMClient.
+
+    Briefings and analyzer workers each construct their own client, so a
+    module-level pool is what actually removes the per-call TLS handshake.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                # Skip the per-request environment scan (proxy vars, .netrc);
+                # the endpoint is configured explicitly via settings.
+                session.trust_env = False
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=POOL_SIZE,
+                    pool_maxsize=POOL_SIZE,
+                    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def close_session() -> None:
+    """Dispose of the shared session's sockets; drivers call this on shutdown."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+
+_ASYNC_CLIENT: Optional["httpx.AsyncClient"] = None
+_ASYNC_CLIENT_LOCK = threading.Lock()
+
+
+def _get_async_client() -> "httpx.AsyncClient":
+    """Shared httpx client for the async call path, mirroring _get_session."""
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        with _ASYNC_CLIENT_LOCK:
+            if _ASYNC_CLIENT is None:
+                _ASYNC_CLIENT = httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                )
+    return _ASYNC_CLIENT
+
+
+async def aclose_client() -> None:
+    """Async counterpart of close_session for the httpx client."""
+    global _ASYNC_CLIENT
+    client = _ASYNC_CLIENT
+    _ASYNC_CLIENT = None
+    if client is not None:
+        await client.aclose()
+
+_FINGERPRINT_DIGITS = re.compile(r"\d+")
+_FINGERPRINT_WS = re.compile(r"\s+")
+
+
+def _text_fingerprint(text: str) -> str:
+    """Canonicalize text so near-duplicate pages map to one cache key.
+
+    Digits and whitespace runs are stripped because mirrors/reposts of the
+    same article typically differ only in timestamps, counters and layout.
+    """
+    canonical = _FINGERPRINT_WS.sub(" ", _FINGERPRINT_DIGITS.sub("", text.casefold()))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+_MOCK_ANALYSIS = {
+    "sentiment_score": 7.5,
+    "sentiment_summary": "測試模式：略過 LLM 呼叫。",
+    "key_discussions": ["測試", "示例", "mock"],
+    "buying_intent": "中",
+}
+
+_MOCK_REVIEW = {
+    "quality_score": 85,
+    "quality_pass": True,
+    "issues": [],
+    "notes": "測試模式：略過 LLM 回測。",
+    "optimized_insights": {
+        "key_messages": ["優化亮點 1", "優化亮點 2"],
+        "ad_angles": ["角度 A", "角度 B"],
+        "audience_fit": ["目標族群 1"],
+        "objections": ["疑慮 1"],
+        "recommended_copy": ["文案範例 1"],
+    },
+}
+
+
 class LLMClient:
     def __init__(self, settings: Settings, dry_run: bool = False) -> None:
         self.settings = settings
         self.dry_run = dry_run
+        # one mock check up-front instead of re-lowering the provider per call
+        self._is_mock = dry_run or settings.llm_provider.lower() == "mock"
+        self._cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS) if TTLCache else None
+        self._analysis_cache = TTLCache(maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL_SECONDS) if TTLCache else None
+        self._cache_lock = threading.Lock()
+
+        # URL, headers and response extractor depend only on settings, so
+        # bind them once here instead of re-deriving them per call.
+        base_url = settings.ollama_base_url.rstrip("/")
+        if settings.ollama_api_mode.lower() == "ollama":
+            self._url = f"{base_url}/api/chat"
+            self._extract = self._extract_ollama
+        else:
+            self._url = f"{base_url}/v1/chat/completions"
+            self._extract = self._extract_openai
+
+        headers = {"Content-Type": "application/json"}
+        if settings.ollama_api_key:
+            key_header = settings.ollama_api_key_header
+            if key_header.lower() == "authorization":
+                headers["Authorization"] = f"Bearer {settings.ollama_api_key}"
+            else:
+                headers[key_header] = settings.ollama_api_key
+        self._headers = headers
+
+    @staticmethod
+    def _extract_ollama(data: Dict[str, Any]) -> str:
+        return data.get("message", {}).get("content", "")
+
+    @staticmethod
+    def _extract_openai(data: Dict[str, Any]) -> str:
+        choices = data.get("choices", [])
+        return choices[0].get("message", {}).get("content", "") if choices else ""
+
+    def _cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        payload = json.dumps(
+            {"model": self.settings.ollama_model, "system": system_prompt, "user": user_prompt},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
     def _call_llm(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        if self.dry_run or self.settings.llm_provider.lower() == "mock":
+        if self._is_mock:
             return {"mock": True}
 
         if not self.settings.ollama_api_key:
             return {"error": "Missing OLLAMA_API_KEY"}
 
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache_key(system_prompt, user_prompt)
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        url, headers, body = self._build_request(system_prompt, user_prompt)
+
+        try:
+            # stream=True defers body download until after the status check,
+            # so oversized provider error pages (HTML stack traces on 5xx)
+            # are never buffered.
+            with _get_session().post(
+                url, headers=headers, data=body, timeout=self.settings.llm_timeout, stream=True
+            ) as resp:
+                if resp.status_code >= 400:
+                    return {"error": f"LLM request failed: HTTP {resp.status_code}"}
+                # orjson.loads over the raw bytes skips the charset dance
+                # in Response.json(); LLM payloads run to tens of KB.
+                data = orjson.loads(resp.content) if orjson is not None else resp.json()
+        except requests.RequestException as exc:
+            return {"error": f"LLM request failed: {exc}"}
+
+        return self._finish_response(data, cache_key)
+
+    async def _call_llm_async(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Async twin of _call_llm over a shared httpx client.
+
+        Lets async drivers fan calls out with asyncio.gather under a
+        semaphore; the caches are shared with the sync path.
+        """
+        if self._is_mock:
+            return {"mock": True}
+
+        if not self.settings.ollama_api_key:
+            return {"error": "Missing OLLAMA_API_KEY"}
+
+        if httpx is None:
+            return self._call_llm(system_prompt, user_prompt)
+
+        cache_key = None
+        if self._cache is not None:
+            cache_key = self._cache_key(system_prompt, user_prompt)
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        url, headers, body = self._build_request(system_prompt, user_prompt)
+
+        try:
+            resp = await _get_async_client().post(
+                url, headers=headers, content=body, timeout=self.settings.llm_timeout
+            )
+            resp.raise_for_status()
+            data = orjson.loads(resp.content) if orjson is not None else resp.json()
+        except httpx.HTTPError as exc:
+            return {"error": f"LLM request failed: {exc}"}
+
+        return self._finish_response(data, cache_key)
+
+    def _build_request(self, system_prompt: str, user_prompt: str) -> tuple:
         payload = {
             "model": self.settings.ollama_model,
             "messages": [
@@ -30,54 +254,80 @@ class LLMClient:
             "temperature": 0.2,
         }
 
-        headers = {"Content-Type": "application/json"}
-        key_header = self.settings.ollama_api_key_header
-        if key_header.lower() == "authorization":
-            headers["Authorization"] = f"Bearer {self.settings.ollama_api_key}"
-        else:
-            headers[key_header] = self.settings.ollama_api_key
-
-        base_url = self.settings.ollama_base_url.rstrip("/")
-        mode = self.settings.ollama_api_mode.lower()
-
-        if mode == "ollama":
-            url = f"{base_url}/api/chat"
+        if orjson is not None:
+            body = orjson.dumps(payload)
         else:
-            url = f"{base_url}/v1/chat/completions"
+            body = json.dumps(payload).encode("utf-8")
 
-        try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=self.settings.llm_timeout)
-            resp.raise_for_status()
-            data = resp.json()
-        except requests.RequestException as exc:
-            return {"error": f"LLM request failed: {exc}"}
+        return self._url, self._headers, body
 
-        if mode == "ollama":
-            content = data.get("message", {}).get("content", "")
-        else:
-            choices = data.get("choices", [])
-            content = choices[0].get("message", {}).get("content", "") if choices else ""
+    def _finish_response(self, data: Dict[str, Any], cache_key: Optional[str]) -> Dict[str, Any]:
+        content = self._extract(data)
 
         try:
             raw = extract_json(content)
         except Exception:
             raw = {"error": "Failed to parse LLM JSON", "raw": content}
 
+        if cache_key is not None and "error" not in raw:
+            with self._cache_lock:
+                self._cache[cache_key] = raw
+
         return raw
 
     def analyze(self, text: str, title: str = "", url: str = "") -> Dict[str, Any]:
         if not text:
             return {"error": "No content extracted"}
 
-        if self.dry_run or self.settings.llm_provider.lower() == "mock":
-            return {
-                "sentiment_score": 7.5,
-                "sentiment_summary": "測試模式：略過 LLM 呼叫。",
-                "key_discussions": ["測試", "示例", "mock"],
-                "buying_intent": "中",
-            }
+        if self._is_mock:
+            return dict(_MOCK_ANALYSIS)
 
-        prompt = (
+        fingerprint = None
+        if self._analysis_cache is not None:
+            fingerprint = _text_fingerprint(text)
+            with self._cache_lock:
+                cached = self._analysis_cache.get(fingerprint)
+            if cached is not None:
+                return cached
+
+        raw = self._call_llm("你是專業的市場輿情分析師，輸出必須是 JSON。", self._analysis_prompt(text, title, url))
+        if "error" in raw:
+            return raw
+
+        result = normalize_analysis(raw)
+        if fingerprint is not None:
+            with self._cache_lock:
+                self._analysis_cache[fingerprint] = result
+        return result
+
+    async def analyze_async(self, text: str, title: str = "", url: str = "") -> Dict[str, Any]:
+        if not text:
+            return {"error": "No content extracted"}
+
+        if self._is_mock:
+            return dict(_MOCK_ANALYSIS)
+
+        fingerprint = None
+        if self._analysis_cache is not None:
+            fingerprint = _text_fingerprint(text)
+            with self._cache_lock:
+                cached = self._analysis_cache.get(fingerprint)
+            if cached is not None:
+                return cached
+
+        raw = await self._call_llm_async("你是專業的市場輿情分析師，輸出必須是 JSON。", self._analysis_prompt(text, title, url))
+        if "error" in raw:
+            return raw
+
+        result = normalize_analysis(raw)
+        if fingerprint is not None:
+            with self._cache_lock:
+                self._analysis_cache[fingerprint] = result
+        return result
+
+    @staticmethod
+    def _analysis_prompt(text: str, title: str, url: str) -> str:
+        return (
             "你是市場輿情分析師。請分析以下內容並以 JSON 回傳：\n"
             "- sentiment_score (1-10)\n"
             "- sentiment_summary (摘要)\n"
@@ -86,19 +336,6 @@ class LLMClient:
             f"標題: {title}\nURL: {url}\n內容:\n{text}"
         )
 
-        raw = self._call_llm("你是專業的市場輿情分析師，輸出必須是 JSON。", prompt)
-        if "error" in raw:
-            return raw
-        if raw.get("mock") is True:
-            return {
-                "sentiment_score": 7.5,
-                "sentiment_summary": "測試模式：略過 LLM 呼叫。",
-                "key_discussions": ["測試", "示例", "mock"],
-                "buying_intent": "中",
-            }
-
-        return normalize_analysis(raw)
-
     def review_quality(
         self,
         analysis: Dict[str, Any],
@@ -108,20 +345,8 @@ class LLMClient:
         product: str = "",
         objective: str = "",
     ) -> Dict[str, Any]:
-        if self.dry_run or self.settings.llm_provider.lower() == "mock":
-            return {
-                "quality_score": 85,
-                "quality_pass": True,
-                "issues": [],
-                "notes": "測試模式：略過 LLM 回測。",
-                "optimized_insights": {
-                    "key_messages": ["優化亮點 1", "優化亮點 2"],
-                    "ad_angles": ["角度 A", "角度 B"],
-                    "audience_fit": ["目標族群 1"],
-                    "objections": ["疑慮 1"],
-                    "recommended_copy": ["文案範例 1"],
-                },
-            }
+        if self._is_mock:
+            return dict(_MOCK_REVIEW)
 
         prompt = (
             "你是行銷資料質量審查與優化專家。請評估下列分析結果，"
@@ -138,19 +363,5 @@ class LLMClient:
         raw = self._call_llm("你是嚴謹的資料品質審查者，輸出必須是 JSON。", prompt)
         if "error" in raw:
             return raw
-        if raw.get("mock") is True:
-            return {
-                "quality_score": 85,
-                "quality_pass": True,
-                "issues": [],
-                "notes": "測試模式：略過 LLM 回測。",
-                "optimized_insights": {
-                    "key_messages": ["優化亮點 1", "優化亮點 2"],
-                    "ad_angles": ["角度 A", "角度 B"],
-                    "audience_fit": ["目標族群 1"],
-                    "objections": ["疑慮 1"],
-                    "recommended_copy": ["文案範例 1"],
-                },
-            }
 
         return raw
@@ -4,6 +4,7 @@ import argparse
 
 from .analyzer import process_pending_tasks
 from .config import Settings
+from .llm_client import close_session
 
 
 def parse_args() -> argparse.Namespace:
@@ -17,7 +18,10 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     settings = Settings.from_env(args.env_file)
-    processed = process_pending_tasks(settings, limit=args.limit, dry_run=args.dry_run)
+    try:
+        processed = process_pending_tasks(settings, limit=args.limit, dry_run=args.dry_run)
+    finally:
+        close_session()
     print(f"Processed: {processed}")
 
 
@@ -4,6 +4,17 @@ import argparse
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
 from .briefing import run_briefing
 from .config import Settings
 
@@ -38,17 +49,17 @@ def main() -> None:
     )
 
     output_path = Path(args.output)
-    output_path.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    output_path.write_bytes(_dumps(result))
 
     md_path = output_path.with_suffix(".md")
     md_content = [
-        f"# Brief Report\n\n品牌: {args.brand}\n產品: {args.product}\n目標: {args.objective}\n",
-        "## Answers\n",
-        json.dumps(result.get("answers", {}), ensure_ascii=False, indent=2),
-        "\n\n## Report\n",
-        json.dumps(result.get("report", {}), ensure_ascii=False, indent=2),
+        f"# Brief Report\n\n品牌: {args.brand}\n產品: {args.product}\n目標: {args.objective}\n".encode("utf-8"),
+        b"## Answers\n",
+        _dumps(result.get("answers", {})),
+        b"\n\n## Report\n",
+        _dumps(result.get("report", {})),
     ]
-    md_path.write_text("\n".join(md_content), encoding="utf-8")
+    md_path.write_bytes(b"\n".join(md_content))
 
     print(f"✅ 已輸出: {output_path} & {md_path}")
 
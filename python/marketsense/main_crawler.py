@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-from pathlib import Path
 from typing import List
 
 from .config import Settings
@@ -37,11 +36,13 @@ def load_urls(args: argparse.Namespace) -> List[str]:
     urls = list(args.url)
 
     if args.urls_file:
-        content = Path(args.urls_file).read_text(encoding="utf-8")
-        for line in content.splitlines():
-            line = line.strip()
-            if line and not line.startswith("#"):
-                urls.append(line)
+        # Stream line by line; seed files can run to hundreds of thousands
+        # of URLs and read_text + splitlines holds the file twice.
+        with open(args.urls_file, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    urls.append(line)
 
     return urls
 
@@ -79,6 +80,10 @@ def main() -> None:
         urls = load_urls(args)
         if not urls:
             raise SystemExit("No URLs provided. Use --url or --urls-file.")
+        deduped = list(dict.fromkeys(urls))
+        if len(deduped) < len(urls):
+            print(f"Skipped {len(urls) - len(deduped)} duplicate URLs")
+        urls = deduped
         targets = [
             CrawlTarget(
                 url=url,
@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import argparse
-from typing import List
+from typing import Iterable
 
 from .config import Settings
 from .firebase_client import get_db_and_bucket
 from .reporting import summarize_tasks
 
+# Everything summarize_tasks reads; projecting to these fields keeps the
+# bulky content/analysis payloads off the wire entirely.
+PROJECTION = [
+    "status",
+    "blocked_suspected",
+    "response_status",
+    "fetch_attempts",
+    "block_signals",
+    "fetch_latency_ms",
+    "url",
+    "quality_review",
+]
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="MarketSense CLI dashboard")
@@ -16,15 +29,45 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def fetch_tasks(settings: Settings, limit: int, status: str = None) -> List[dict]:
+def fetch_tasks(settings: Settings, limit: int, status: str = None) -> Iterable[dict]:
     db, _ = get_db_and_bucket(settings)
     query = db.collection("crawling_tasks")
+    if hasattr(query, "select"):
+        query = query.select(PROJECTION)
     if status:
         query = query.where("status", "==", status)
     if limit:
         query = query.limit(limit)
-    docs = query.stream()
-    return [doc.to_dict() for doc in docs]
+    for doc in query.stream():
+        yield doc.to_dict()
+
+
+def aggregate_task_counts(settings: Settings, status: str = None) -> dict:
+    """Collection-wide counters via server-side count() aggregation.
+
+    The streamed summary only sees up to --limit docs; these queries
+    return exact totals in a fixed-size RPC each. Returns {} when the
+    client has no aggregation support (test fakes, old SDKs).
+    """
+    db, _ = get_db_and_bucket(settings)
+    base = db.collection("crawling_tasks")
+    if not hasattr(base, "count"):
+        return {}
+
+    def _count(query) -> int:
+        result = query.count().get()
+        return int(result[0][0].value)
+
+    try:
+        scoped = base.where("status", "==", status) if status else base
+        return {
+            "total": _count(scoped),
+            "errors": _count(base.where("status", "==", "error")),
+            "blocked": _count(base.where("blocked_suspected", "==", True)),
+        }
+    except Exception as exc:
+        print(f"⚠️ Aggregation query failed: {exc}")
+        return {}
 
 
 def main() -> None:
@@ -33,8 +76,16 @@ def main() -> None:
 
     tasks = fetch_tasks(settings, args.limit, args.status)
     summary = summarize_tasks(tasks)
+    collection_counts = aggregate_task_counts(settings, args.status)
 
     print("=== MarketSense Dashboard ===")
+    if collection_counts:
+        print(
+            "Collection totals: "
+            f"{collection_counts['total']} tasks, "
+            f"{collection_counts['errors']} errors, "
+            f"{collection_counts['blocked']} blocked suspected"
+        )
     print(f"Total tasks: {summary['total']}")
     print(f"Status counts: {summary['status_counts']}")
     print(f"Blocked suspected: {summary['blocked_suspected']} ({summary['block_rate']:.2%})")
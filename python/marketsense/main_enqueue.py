@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import argparse
-from pathlib import Path
 from typing import List
 
 from .config import Settings
@@ -25,11 +24,13 @@ def load_urls(args: argparse.Namespace) -> List[str]:
     urls = list(args.url)
 
     if args.urls_file:
-        content = Path(args.urls_file).read_text(encoding="utf-8")
-        for line in content.splitlines():
-            line = line.strip()
-            if line and not line.startswith("#"):
-                urls.append(line)
+        # Stream line by line; seed files can run to hundreds of thousands
+        # of URLs and read_text + splitlines holds the file twice.
+        with open(args.urls_file, "r", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    urls.append(line)
 
     return urls
 
@@ -42,6 +43,13 @@ def main() -> None:
     if not urls:
         raise SystemExit("No URLs provided. Use --url or --urls-file.")
 
+    # Drop duplicates client-side (order-preserving) before they each cost
+    # a Firestore round-trip in enqueue_urls.
+    deduped = list(dict.fromkeys(urls))
+    if len(deduped) < len(urls):
+        print(f"Skipped {len(urls) - len(deduped)} duplicate URLs")
+    urls = deduped
+
     db, _ = get_db_and_bucket(settings)
     count = enqueue_urls(
         db,
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import partial
 
 from .config import Settings
 from .firebase_client import get_db_and_bucket
@@ -27,24 +29,33 @@ def main() -> None:
     now = datetime.now(timezone.utc)
     limit = args.limit
 
+    # The requested actions hit disjoint task sets, so their Firestore
+    # round-trips can overlap; output order still follows the flag order.
+    actions = []
+
     if args.reclaim_running:
-        reclaimed = reclaim_expired_leases(db, limit, now)
-        print(f"Reclaimed running: {reclaimed}")
+        actions.append(("Reclaimed running", partial(reclaim_expired_leases, db, limit, now)))
 
     if args.requeue_analyzed_hours is not None:
         older_than = now - timedelta(hours=args.requeue_analyzed_hours)
-        reclaimed = requeue_stale_tasks(db, "analyzed", older_than, limit)
-        print(f"Requeued analyzed: {reclaimed}")
+        actions.append(("Requeued analyzed", partial(requeue_stale_tasks, db, "analyzed", older_than, limit)))
 
     if args.requeue_downloaded_hours is not None:
         older_than = now - timedelta(hours=args.requeue_downloaded_hours)
-        reclaimed = requeue_stale_tasks(db, "downloaded", older_than, limit)
-        print(f"Requeued downloaded: {reclaimed}")
+        actions.append(("Requeued downloaded", partial(requeue_stale_tasks, db, "downloaded", older_than, limit)))
 
     if args.requeue_error_hours is not None:
         older_than = now - timedelta(hours=args.requeue_error_hours)
-        reclaimed = requeue_error_tasks(db, older_than, limit)
-        print(f"Requeued errors: {reclaimed}")
+        actions.append(("Requeued errors", partial(requeue_error_tasks, db, older_than, limit)))
+
+    if not actions:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(actions)) as pool:
+        counts = list(pool.map(lambda item: item[1](), actions))
+
+    for (label, _), count in zip(actions, counts):
+        print(f"{label}: {count}")
 
 
 if __name__ == "__main__":
@@ -4,11 +4,23 @@ import argparse
 import csv
 import json
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
 
 from .config import Settings
 from .firebase_client import get_db_and_bucket
-from .reporting import summarize_tasks, task_rows
+from .reporting import TASK_FIELDS, summarize_tasks, task_row
+
+
+def _dumps(obj) -> bytes:
+    """Serialize with orjson when available; exports can hold thousands of tasks."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=str).encode("utf-8")
 
 
 def parse_args() -> argparse.Namespace:
@@ -22,49 +34,100 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def fetch_tasks(settings: Settings, limit: int, status: str = None) -> List[dict]:
+# Everything summarize_tasks and task_rows read; projecting to these keeps
+# raw page content and full analysis payloads off the wire.
+PROJECTION = [
+    "url",
+    "status",
+    "response_status",
+    "blocked_suspected",
+    "fetch_attempts",
+    "fetch_latency_ms",
+    "title",
+    "storage_path",
+    "local_path",
+    "quality_review",
+    "error_log",
+    "created_at",
+    "analyzed_at",
+    "quality_reviewed_at",
+    "block_signals",
+]
+
+
+def fetch_tasks(settings: Settings, limit: int, status: str = None) -> Iterator[dict]:
     db, _ = get_db_and_bucket(settings)
     query = db.collection("crawling_tasks")
+    if hasattr(query, "select"):
+        query = query.select(PROJECTION)
     if status:
         query = query.where("status", "==", status)
     if limit:
         query = query.limit(limit)
-    docs = query.stream()
-    return [doc.to_dict() for doc in docs]
+    for doc in query.stream():
+        yield doc.to_dict()
+
+
+def stream_and_report(
+    settings: Settings,
+    limit: int,
+    status: str = None,
+    csv_path: str = None,
+    keep_tasks: bool = False,
+) -> Tuple[dict, List[dict]]:
+    """Consume the Firestore stream once for summary, CSV and task buffer.
+
+    Summary accumulation and CSV rows happen on the same iteration, so
+    the stream is never replayed; the raw dicts are only buffered when
+    the JSON output actually embeds them (--include-tasks).
+    """
+    tasks = fetch_tasks(settings, limit, status)
+    kept: List[dict] = []
+
+    def _pipe(writer=None):
+        for task in tasks:
+            if keep_tasks:
+                kept.append(task)
+            if writer is not None:
+                writer.writerow(task_row(task))
+            yield task
+
+    if csv_path:
+        with open(csv_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as handle:
+            writer = csv.writer(handle)
+            writer.writerow(TASK_FIELDS)
+            summary = summarize_tasks(_pipe(writer))
+    else:
+        summary = summarize_tasks(_pipe())
+    return summary, kept
 
 
 def write_json(path: str, summary: dict, tasks: List[dict], include_tasks: bool) -> None:
     payload = {"summary": summary}
     if include_tasks:
         payload["tasks"] = tasks
-    Path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-
-
-def write_csv(path: str, tasks: List[dict]) -> None:
-    rows = task_rows(tasks)
-    if not rows:
-        Path(path).write_text("", encoding="utf-8")
-        return
-    with open(path, "w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
+    # _dumps yields one bytes buffer, so this lands in a single write
+    # syscall with no intermediate str or re-encode pass.
+    Path(path).write_bytes(_dumps(payload))
 
 
 def main() -> None:
     args = parse_args()
     settings = Settings.from_env(args.env_file)
 
-    tasks = fetch_tasks(settings, args.limit, args.status)
-    summary = summarize_tasks(tasks)
+    summary, tasks = stream_and_report(
+        settings,
+        args.limit,
+        args.status,
+        csv_path=args.output_csv,
+        keep_tasks=bool(args.output_json and args.include_tasks),
+    )
 
     if args.output_json:
         write_json(args.output_json, summary, tasks, args.include_tasks)
-    if args.output_csv:
-        write_csv(args.output_csv, tasks)
 
     if not args.output_json and not args.output_csv:
-        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        print(_dumps(summary).decode("utf-8"))
 
 
 if __name__ == "__main__":
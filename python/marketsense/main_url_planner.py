@@ -5,6 +5,11 @@ import json
 from pathlib import Path
 from typing import List
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
 from .config import Settings
 from .url_planner import build_url_plan, save_url_plan
 
@@ -41,7 +46,8 @@ def main() -> None:
     args = parse_args()
     settings = Settings.from_env(args.env_file)
 
-    report = json.loads(Path(args.report_file).read_text(encoding="utf-8"))
+    report_bytes = Path(args.report_file).read_bytes()
+    report = orjson.loads(report_bytes) if orjson is not None else json.loads(report_bytes)
     brand = args.brand or report.get("brand", "")
     product = args.product or report.get("product", "")
     objective = args.objective or report.get("objective", "")
@@ -60,7 +66,10 @@ def main() -> None:
     )
 
     Path(args.output).write_text("\n".join(payload["urls"]) + "\n", encoding="utf-8")
-    Path(args.json_output).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    if orjson is not None:
+        Path(args.json_output).write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        Path(args.json_output).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
     if not args.no_firestore:
         save_url_plan(settings, payload)
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 from .config import Settings
 from .crawler import CrawlTarget, run_crawl
@@ -19,6 +20,11 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-delay", type=float, help="Max delay seconds")
     parser.add_argument("--retries", type=int, help="Retry attempts")
     parser.add_argument("--stop-block-rate", type=float, default=0.05, help="Stop if blocked ratio exceeds this")
+    parser.add_argument(
+        "--parallel-levels",
+        type=int,
+        help="Run all levels at once in this many worker processes (disables --stop-block-rate early stop)",
+    )
     return parser.parse_args()
 
 
@@ -26,15 +32,39 @@ def load_urls(args: argparse.Namespace) -> List[str]:
     urls = list(args.url)
 
     if args.urls_file:
-        content = Path(args.urls_file).read_text(encoding="utf-8")
-        for line in content.splitlines():
+        # Split as bytes and decode only the kept lines, so comments and
+        # blanks in big URL lists never pay the UTF-8 decode.
+        for line in Path(args.urls_file).read_bytes().splitlines():
             line = line.strip()
-            if line and not line.startswith("#"):
-                urls.append(line)
+            if line and not line.startswith(b"#"):
+                urls.append(line.decode("utf-8"))
 
     return urls
 
 
+def _probe_one(level: int, urls: List[str], settings: Settings) -> Tuple[int, int, int, int]:
+    """Run one concurrency level in its own event loop.
+
+    Module-level (and fed plain urls/settings) so it pickles cleanly into
+    worker processes for --parallel-levels.
+    """
+    targets = [CrawlTarget(url=url) for url in urls]
+    probe_settings = settings.with_overrides(max_concurrent=level)
+    results = asyncio.run(run_crawl(targets, probe_settings))
+
+    total = len(results)
+    success = sum(1 for r in results if r.get("success"))
+    blocked = sum(1 for r in results if r.get("blocked_suspected"))
+    return level, success, blocked, total
+
+
+def _print_level(level: int, success: int, blocked: int, total: int) -> float:
+    block_rate = blocked / total if total else 0
+    print(f"\n== Probe level: concurrency={level} ==")
+    print(f"Success: {success}/{total} | Blocked suspected: {blocked} ({block_rate:.2%})")
+    return block_rate
+
+
 def main() -> None:
     args = parse_args()
     settings = Settings.from_env(args.env_file).with_overrides(
@@ -46,20 +76,21 @@ def main() -> None:
     urls = load_urls(args)
     if not urls:
         raise SystemExit("No URLs provided. Use --url or --urls-file.")
-    targets = [CrawlTarget(url=url) for url in urls]
 
     levels = [int(x.strip()) for x in args.levels.split(",") if x.strip()]
-    for level in levels:
-        print(f"\n== Probe level: concurrency={level} ==")
-        probe_settings = settings.with_overrides(max_concurrent=level)
-        results = asyncio.run(run_crawl(targets, probe_settings))
 
-        total = len(results)
-        success = sum(1 for r in results if r.get("success"))
-        blocked = sum(1 for r in results if r.get("blocked_suspected"))
-        block_rate = blocked / total if total else 0
+    if args.parallel_levels:
+        # All levels run at once, so total wall time is the slowest level
+        # instead of the sum. The block-rate early stop cannot apply here;
+        # results are still reported in level order.
+        with ProcessPoolExecutor(max_workers=args.parallel_levels) as pool:
+            futures = [pool.submit(_probe_one, level, urls, settings) for level in levels]
+            for future in futures:
+                _print_level(*future.result())
+        return
 
-        print(f"Success: {success}/{total} | Blocked suspected: {blocked} ({block_rate:.2%})")
+    for level in levels:
+        block_rate = _print_level(*_probe_one(level, urls, settings))
         if block_rate >= args.stop_block_rate:
             print("Stop: block rate exceeded threshold")
             break
@@ -1,6 +1,18 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import hashlib
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - md5 fallback
+    xxhash = None
 
 try:
     from firebase_admin import firestore
@@ -47,6 +59,62 @@ def _normalize_quality(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def _analysis_hash(analysis: Dict[str, Any]) -> str:
+    """Stable hash of an analysis payload, used to skip unchanged re-reviews."""
+    if orjson is not None:
+        blob = orjson.dumps(analysis, option=orjson.OPT_SORT_KEYS, default=str)
+    else:
+        blob = json.dumps(analysis, sort_keys=True, default=str).encode("utf-8")
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(blob)
+    return hashlib.md5(blob).hexdigest()
+
+
+def _review_one(
+    doc,
+    client: LLMClient,
+    mark_optimized: bool,
+    brand: str,
+    product: str,
+    objective: str,
+) -> Tuple[object, Dict[str, Any]]:
+    """Review a single analyzed doc and build its update payload."""
+    data = doc.to_dict()
+    title = data.get("title", "")
+    url = data.get("url", "")
+    analysis = data.get("analysis", {})
+
+    result = client.review_quality(
+        analysis=analysis,
+        title=title,
+        url=url,
+        brand=brand or data.get("brand", ""),
+        product=product or data.get("product", ""),
+        objective=objective or data.get("objective", ""),
+    )
+
+    if "error" in result:
+        payload = {
+            "quality_review": {"error": result.get("error"), "raw": result.get("raw", "")},
+            "quality_reviewed_at": firestore.SERVER_TIMESTAMP,
+        }
+    else:
+        normalized = _normalize_quality(result)
+        payload = {
+            "quality_review": normalized,
+            "quality_reviewed_at": firestore.SERVER_TIMESTAMP,
+            # Stored so a later --force run can prove the analysis is
+            # unchanged and skip the paid LLM call. Errors deliberately
+            # store no hash so they are always retried.
+            "quality_analysis_hash": _analysis_hash(analysis),
+            "optimized_insights": normalized.get("optimized_insights", {}),
+            "optimized_at": firestore.SERVER_TIMESTAMP,
+        }
+        if mark_optimized:
+            payload["status"] = "optimized"
+    return doc.reference, payload
+
+
 def review_analyzed_tasks(
     settings: Settings,
     limit: Optional[int] = None,
@@ -57,51 +125,73 @@ def review_analyzed_tasks(
     product: str = "",
     objective: str = "",
 ) -> int:
+    """Review analyzed tasks with a bounded window of in-flight reviews.
+
+    The LLM review and the Firestore write-back of the previous doc run on
+    separate pool threads, so write latency hides behind the next review
+    instead of adding to it. Mirrors the analyzer's fan-out.
+    """
     db, _ = get_db_and_bucket(settings)
-    docs = db.collection("crawling_tasks").where("status", "==", "analyzed").stream()
+    query = db.collection("crawling_tasks").where("status", "==", "analyzed")
+    if hasattr(query, "select"):
+        # The review only needs these fields; dropping raw content/clean
+        # text from the stream shrinks each page of results considerably.
+        query = query.select(
+            [
+                "quality_reviewed_at",
+                "quality_analysis_hash",
+                "title",
+                "url",
+                "analysis",
+                "brand",
+                "product",
+                "objective",
+            ]
+        )
+    docs = query.stream()
     client = LLMClient(settings, dry_run=dry_run)
 
-    processed = 0
-    for doc in docs:
-        if limit is not None and processed >= limit:
-            break
-
-        data = doc.to_dict()
-        if not force and data.get("quality_reviewed_at"):
-            continue
-
-        title = data.get("title", "")
-        url = data.get("url", "")
-        analysis = data.get("analysis", {})
-
-        result = client.review_quality(
-            analysis=analysis,
-            title=title,
-            url=url,
-            brand=brand or data.get("brand", ""),
-            product=product or data.get("product", ""),
-            objective=objective or data.get("objective", ""),
-        )
+    max_workers = max(1, settings.max_concurrent)
+
+    def _next_doc():
+        for doc in docs:
+            data = doc.to_dict()
+            if not force and data.get("quality_reviewed_at"):
+                continue
+            if force:
+                # An unchanged analysis would produce the same review;
+                # the hash compare saves the whole LLM round-trip.
+                prior_hash = data.get("quality_analysis_hash")
+                if prior_hash and prior_hash == _analysis_hash(data.get("analysis") or {}):
+                    continue
+            return doc
+        return None
 
-        if "error" in result:
-            doc.reference.update(
-                {
-                    "quality_review": {"error": result.get("error"), "raw": result.get("raw", "")},
-                    "quality_reviewed_at": firestore.SERVER_TIMESTAMP,
-                }
-            )
-        else:
-            normalized = _normalize_quality(result)
-            payload = {
-                "quality_review": normalized,
-                "quality_reviewed_at": firestore.SERVER_TIMESTAMP,
-                "optimized_insights": normalized.get("optimized_insights", {}),
-                "optimized_at": firestore.SERVER_TIMESTAMP,
-            }
-            if mark_optimized:
-                payload["status"] = "optimized"
-            doc.reference.update(payload)
-
-        processed += 1
+    processed = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+
+        def _submit_next() -> bool:
+            doc = _next_doc()
+            if doc is None:
+                return False
+            pending.add(pool.submit(_review_one, doc, client, mark_optimized, brand, product, objective))
+            return True
+
+        for _ in range(max_workers):
+            if limit is not None and len(pending) >= limit:
+                break
+            if not _submit_next():
+                break
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                ref, payload = future.result()
+                ref.update(payload)
+                processed += 1
+            while (limit is None or processed + len(pending) < limit) and len(pending) < max_workers:
+                if not _submit_next():
+                    break
 
     return processed
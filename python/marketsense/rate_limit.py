@@ -1,37 +1,78 @@
 from __future__ import annotations
 
 import asyncio
-import time
+import functools
+import re
 from typing import Dict
 from urllib.parse import urlparse
 
+try:
+    from cachetools import LRUCache
+except ImportError:  # pragma: no cover - staleness pruning fallback
+    LRUCache = None
+
 from .config import Settings
 
 
+_NETLOC_RE = re.compile(r"^[a-z][a-z0-9+.\-]*://([^/?#]+)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=8192)
 def domain_from_url(url: str) -> str:
-    parsed = urlparse(url)
-    return parsed.netloc.lower()
+    # Runs for every request via wait() and record_result(). The regex
+    # grabs the netloc directly for ordinary absolute URLs; urlparse (which
+    # also splits path/query/fragment into a namedtuple) only handles the
+    # exotic rest.
+    match = _NETLOC_RE.match(url)
+    if match:
+        return match.group(1).lower()
+    return urlparse(url).netloc.lower()
 
 
 class DomainRateLimiter:
+    # Hard cap on tracked domains. With cachetools the caps are enforced
+    # by LRU eviction; the dict fallback prunes entries idle longer than
+    # _PRUNE_IDLE_SECONDS once it outgrows the cap.
+    _MAX_DOMAINS = 4096
+    _PRUNE_IDLE_SECONDS = 3600.0
+
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
-        self._locks: Dict[str, asyncio.Lock] = {}
-        self._last_request: Dict[str, float] = {}
-        self._delay: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        if LRUCache is not None:
+            self._next_allowed = LRUCache(maxsize=self._MAX_DOMAINS)
+            self._delay = LRUCache(maxsize=self._MAX_DOMAINS)
+        else:
+            self._next_allowed: Dict[str, float] = {}
+            self._delay: Dict[str, float] = {}
 
     async def wait(self, url: str) -> None:
         domain = domain_from_url(url)
-        lock = self._locks.setdefault(domain, asyncio.Lock())
 
-        async with lock:
-            now = time.time()
-            last = self._last_request.get(domain, 0.0)
+        # One lock guards only the O(1) slot claim, so there is no lock
+        # object per domain and waiters for different domains never
+        # serialize their sleeps. Event-loop time is monotonic, immune to
+        # wall-clock jumps.
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
             delay = self._delay.get(domain, self.settings.domain_delay_base)
-            sleep_for = delay - (now - last)
-            if sleep_for > 0:
-                await asyncio.sleep(sleep_for)
-            self._last_request[domain] = time.time()
+            scheduled = max(now, self._next_allowed.get(domain, 0.0))
+            self._next_allowed[domain] = scheduled + delay
+            if LRUCache is None and len(self._next_allowed) > self._MAX_DOMAINS:
+                self._prune(now)
+
+        sleep_for = scheduled - now
+        if sleep_for > 0:
+            await asyncio.sleep(sleep_for)
+
+    def _prune(self, now: float) -> None:
+        """Drop domains idle for over an hour; long crawls touch many once."""
+        cutoff = now - self._PRUNE_IDLE_SECONDS
+        stale = [domain for domain, ts in self._next_allowed.items() if ts < cutoff]
+        for domain in stale:
+            self._next_allowed.pop(domain, None)
+            self._delay.pop(domain, None)
 
     def record_result(self, url: str, blocked: bool) -> None:
         domain = domain_from_url(url)
@@ -1,21 +1,72 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import re
+import threading
 import time
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Iterable, Optional
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - prefetch falls back to threads
+    httpx = None
+try:
+    from cachetools import TTLCache
+except ImportError:  # pragma: no cover - manual expiry fallback
+    TTLCache = None
 
 from .config import Settings
 
 
-def domain_from_url(url: str) -> str:
-    parsed = urlparse(url)
-    return parsed.netloc.lower()
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Shared keep-alive session for robots.txt fetches.
 
+    A crawl touches each domain's robots.txt once, but a fresh
+    requests.get per domain still pays DNS plus a TLS handshake every
+    time; pooling at least reuses connections for same-host retries and
+    skips per-call session setup.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                session.trust_env = False
+                adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=1)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
 
-def is_domain_allowed(url: str, allow_domains: list, deny_domains: list) -> bool:
+
+_NETLOC_RE = re.compile(r"^[a-z][a-z0-9+.\-]*://([^/?#]+)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=8192)
+def domain_from_url(url: str) -> str:
+    match = _NETLOC_RE.match(url)
+    if match:
+        return match.group(1).lower()
+    return urlparse(url).netloc.lower()
+
+
+def is_domain_allowed(url: str, allow_domains, deny_domains) -> bool:
+    # Settings provides frozensets; plain lists from older callers are
+    # adapted so the per-URL membership check stays O(1) either way.
+    if not isinstance(allow_domains, (set, frozenset)):
+        allow_domains = frozenset(allow_domains)
+    if not isinstance(deny_domains, (set, frozenset)):
+        deny_domains = frozenset(deny_domains)
     domain = domain_from_url(url)
     if deny_domains and domain in deny_domains:
         return False
@@ -31,8 +82,24 @@ class RobotsCache:
         fetcher: Optional[Callable[[str], str]] = None,
     ) -> None:
         self.settings = settings
-        self._cache: Dict[str, tuple] = {}
+        # TTLCache expires entries itself, so allowed() skips the
+        # per-call time.time() + expiry branch on the hot path.
+        if TTLCache is not None:
+            self._cache = TTLCache(maxsize=1024, ttl=settings.robots_cache_ttl)
+        else:
+            self._cache: Dict[str, tuple] = {}
+        self._uses_ttl_cache = TTLCache is not None
         self._fetcher = fetcher or self._default_fetcher
+        # Instances are shared across threads (validate_urls fan-out, the
+        # process-wide cache); guard cache mutations, fetch outside it.
+        self._cache_lock = threading.Lock()
+
+    def _store_parser(self, domain: str, parser: RobotFileParser) -> None:
+        with self._cache_lock:
+            if self._uses_ttl_cache:
+                self._cache[domain] = parser
+            else:
+                self._cache[domain] = (parser, time.time() + self.settings.robots_cache_ttl)
 
     def allowed(self, url: str) -> bool:
         if not self.settings.robots_enabled:
@@ -46,11 +113,13 @@ class RobotsCache:
         return robots.can_fetch(self.settings.robots_user_agent, url)
 
     def _get_parser(self, domain: str) -> Optional[RobotFileParser]:
-        now = time.time()
-        cached = self._cache.get(domain)
-        if cached:
+        with self._cache_lock:
+            cached = self._cache.get(domain)
+        if cached is not None:
+            if self._uses_ttl_cache:
+                return cached
             parser, expires_at = cached
-            if expires_at > now:
+            if expires_at > time.time():
                 return parser
 
         try:
@@ -60,12 +129,70 @@ class RobotsCache:
 
         parser = RobotFileParser()
         parser.parse(content.splitlines())
-        self._cache[domain] = (parser, now + self.settings.robots_cache_ttl)
+        self._store_parser(domain, parser)
         return parser
 
+    def ensure_loaded(self, domain: str) -> None:
+        """Warm one domain's parser synchronously; fetch failures are
+        left for allowed() to handle under the fail-open policy."""
+        with self._cache_lock:
+            if domain in self._cache:
+                return
+        try:
+            content = self._fetcher(domain)
+        except Exception:
+            return
+        parser = RobotFileParser()
+        parser.parse(content.splitlines())
+        self._store_parser(domain, parser)
+
+    async def prefetch(self, domains: Iterable[str]) -> None:
+        """Warm the cache for many domains concurrently before a crawl.
+
+        With httpx installed all robots.txt files download in one
+        gathered pass; otherwise the fetches fan out to threads over the
+        shared session. Failures are ignored — allowed() re-fetches and
+        applies the usual fail-open/fail-closed policy.
+        """
+        wanted = [d for d in dict.fromkeys(domains) if d and d not in self._cache]
+        if not wanted:
+            return
+
+        async def _store(domain: str, content: Optional[str]) -> None:
+            if content is None:
+                return
+            parser = RobotFileParser()
+            parser.parse(content.splitlines())
+            self._store_parser(domain, parser)
+
+        if httpx is not None:
+            async with httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=64), timeout=10
+            ) as client:
+
+                async def _fetch(domain: str) -> None:
+                    try:
+                        resp = await client.get(f"https://{domain}/robots.txt")
+                        resp.raise_for_status()
+                        await _store(domain, resp.text)
+                    except Exception:
+                        pass
+
+                await asyncio.gather(*[_fetch(domain) for domain in wanted])
+            return
+
+        async def _fetch_thread(domain: str) -> None:
+            try:
+                content = await asyncio.to_thread(self._fetcher, domain)
+                await _store(domain, content)
+            except Exception:
+                pass
+
+        await asyncio.gather(*[_fetch_thread(domain) for domain in wanted])
+
     @staticmethod
     def _default_fetcher(domain: str) -> str:
         url = f"https://{domain}/robots.txt"
-        response = requests.get(url, timeout=10)
+        response = _get_session().get(url, timeout=10)
         response.raise_for_status()
         return response.text
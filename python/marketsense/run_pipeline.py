@@ -14,6 +14,7 @@ from datetime import datetime, timedelta, timezone
 
 from .task_queue import (
     enqueue_urls,
+    enqueue_and_claim,
     claim_pending_tasks,
     reclaim_expired_leases,
     requeue_stale_tasks,
@@ -29,6 +30,11 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--use-firestore", action="store_true", help="Use Firestore pending queue")
     parser.add_argument("--limit-pending", type=int, default=50, help="Limit pending tasks")
     parser.add_argument("--lease-seconds", type=int, default=600, help="Lease duration for running tasks")
+    parser.add_argument(
+        "--claim-atomic",
+        action="store_true",
+        help="Enqueue and claim the given URLs in one batched write (skips the shared pending queue)",
+    )
     parser.add_argument("--limit-analyze", type=int, help="Limit analyzed tasks")
     parser.add_argument("--dry-run", action="store_true", help="Skip LLM call and return mock analysis")
     parser.add_argument("--quality-review", action="store_true", help="Run LLM quality review and optimization")
@@ -46,11 +52,12 @@ def load_urls(args: argparse.Namespace) -> List[str]:
     urls = list(args.url)
 
     if args.urls_file:
-        content = Path(args.urls_file).read_text(encoding="utf-8")
-        for line in content.splitlines():
+        # Split as bytes and decode only the kept lines, so comments and
+        # blanks in big URL lists never pay the UTF-8 decode.
+        for line in Path(args.urls_file).read_bytes().splitlines():
             line = line.strip()
-            if line and not line.startswith("#"):
-                urls.append(line)
+            if line and not line.startswith(b"#"):
+                urls.append(line.decode("utf-8"))
 
     return urls
 
@@ -92,14 +99,28 @@ def main() -> None:
                 now - timedelta(hours=settings.requeue_error_after_hours),
                 args.limit_pending,
             )
-        enqueue_urls(
-            db,
-            urls,
-            brand=args.brand or "",
-            product=args.product or "",
-            objective=args.objective or "",
-        )
-        pending = claim_pending_tasks(db, args.limit_pending, lease_seconds=args.lease_seconds)
+        if args.claim_atomic:
+            # One batched write per 450 URLs instead of an enqueue pass
+            # followed by a claim transaction per doc; only safe because
+            # this run owns exactly the URLs it was given.
+            pending = enqueue_and_claim(
+                db,
+                urls,
+                limit=args.limit_pending,
+                lease_seconds=args.lease_seconds,
+                brand=args.brand or "",
+                product=args.product or "",
+                objective=args.objective or "",
+            )
+        else:
+            enqueue_urls(
+                db,
+                urls,
+                brand=args.brand or "",
+                product=args.product or "",
+                objective=args.objective or "",
+            )
+            pending = claim_pending_tasks(db, args.limit_pending, lease_seconds=args.lease_seconds)
         if not pending:
             raise SystemExit("No pending tasks found in Firestore.")
         targets = [
@@ -0,0 +1,65 @@
+"""Shared Firestore fakes for the integration tests.
+
+Each integration module used to define its own identical FakeDocRef /
+FakeDoc / FakeCollection / FakeDB quartet; keeping one copy here trims
+collection time and lets new tests pick the fakes up as fixtures.
+Storage fakes (blobs/buckets) differ per test and stay local.
+"""
+import pytest
+
+
+class FakeDocRef:
+    def __init__(self, data):
+        self.data = data
+        self.updated = None
+
+    def update(self, payload):
+        # Keep the last write as-is instead of merging into data on every
+        # call; tests assert on .updated, and to_dict() merges lazily.
+        self.updated = payload
+
+    def to_dict(self):
+        return {**self.data, **(self.updated or {})}
+
+
+class FakeDoc:
+    def __init__(self, data):
+        self._data = data
+        self.reference = FakeDocRef(data)
+
+    def to_dict(self):
+        return self._data
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def where(self, *_args, **_kwargs):
+        return self
+
+    def stream(self):
+        # Lazy like the real client's stream(); large fixtures are only
+        # consumed as far as the code under test iterates.
+        yield from self._docs
+
+
+class FakeDB:
+    def __init__(self, docs):
+        self._collection = FakeCollection(docs)
+
+    def collection(self, _name: str):
+        return self._collection
+
+
+@pytest.fixture
+def fake_doc_factory():
+    return FakeDoc
+
+
+@pytest.fixture
+def fake_db_factory():
+    def _factory(docs):
+        return FakeDB(docs)
+
+    return _factory
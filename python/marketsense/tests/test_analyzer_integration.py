@@ -2,25 +2,6 @@ from marketsense.analyzer import process_pending_tasks
 from marketsense.config import Settings
 
 
-class FakeDocRef:
-    def __init__(self, data):
-        self.data = data
-        self.updated = None
-
-    def update(self, payload):
-        self.updated = payload
-        self.data.update(payload)
-
-
-class FakeDoc:
-    def __init__(self, data):
-        self._data = data
-        self.reference = FakeDocRef(data)
-
-    def to_dict(self):
-        return self._data
-
-
 class FakeBlob:
     def __init__(self, content: bytes):
         self._content = content
@@ -37,40 +18,47 @@ class FakeBucket:
         return FakeBlob(self._payload)
 
 
-class FakeCollection:
-    def __init__(self, docs):
-        self._docs = docs
+def test_process_pending_tasks(monkeypatch, fake_doc_factory, fake_db_factory):
+    html = b"<html><body><p>Hello</p></body></html>"
+    fake_doc = fake_doc_factory({"storage_path": "raw_html/1.html.gz", "title": "T", "url": "U"})
 
-    def where(self, *_args, **_kwargs):
-        return self
+    monkeypatch.setenv("FIREBASE_STORAGE_BUCKET", "bucket")
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
 
-    def stream(self):
-        return self._docs
+    settings = Settings.from_env()
 
+    def fake_get_db_and_bucket(_settings):
+        return fake_db_factory([fake_doc]), FakeBucket(html)
 
-class FakeDB:
-    def __init__(self, docs):
-        self._collection = FakeCollection(docs)
+    monkeypatch.setattr("marketsense.analyzer.get_db_and_bucket", fake_get_db_and_bucket)
 
-    def collection(self, _name: str):
-        return self._collection
+    processed = process_pending_tasks(settings, limit=1, dry_run=True)
+    assert processed == 1
+    assert fake_doc.reference.updated is not None
+    assert fake_doc.reference.updated.get("status") in {"analyzed", "error"}
 
 
-def test_process_pending_tasks(monkeypatch):
+def test_limit_caps_updates_below_max_concurrent(monkeypatch, fake_doc_factory, fake_db_factory):
     html = b"<html><body><p>Hello</p></body></html>"
-    fake_doc = FakeDoc({"storage_path": "raw_html/1.html.gz", "title": "T", "url": "U"})
+    fake_docs = [
+        fake_doc_factory({"storage_path": f"raw_html/{i}.html.gz", "title": "T", "url": f"U{i}"})
+        for i in range(20)
+    ]
 
     monkeypatch.setenv("FIREBASE_STORAGE_BUCKET", "bucket")
     monkeypatch.setenv("LLM_PROVIDER", "mock")
+    monkeypatch.setenv("MAX_CONCURRENT", "8")
 
     settings = Settings.from_env()
 
     def fake_get_db_and_bucket(_settings):
-        return FakeDB([fake_doc]), FakeBucket(html)
+        return fake_db_factory(fake_docs), FakeBucket(html)
 
     monkeypatch.setattr("marketsense.analyzer.get_db_and_bucket", fake_get_db_and_bucket)
 
-    processed = process_pending_tasks(settings, limit=1, dry_run=True)
-    assert processed == 1
-    assert fake_doc.reference.updated is not None
-    assert fake_doc.reference.updated.get("status") in {"analyzed", "error"}
+    processed = process_pending_tasks(settings, limit=2, dry_run=True)
+    assert processed == 2
+    # A --limit spot-check must not analyze (and mutate) extra docs just
+    # because the worker window is wider than the limit.
+    updated = [doc for doc in fake_docs if doc.reference.updated is not None]
+    assert len(updated) == 2
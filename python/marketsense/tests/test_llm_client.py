@@ -27,3 +27,61 @@ def test_llm_quality_review_dry_run(monkeypatch):
 
     assert result["quality_score"] >= 0
     assert "optimized_insights" in result
+
+
+def test_llm_client_response_cache(monkeypatch):
+    monkeypatch.setenv("FIREBASE_STORAGE_BUCKET", "bucket")
+    monkeypatch.setenv("OLLAMA_API_KEY", "dummy")
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    settings = Settings.from_env()
+
+    calls = {"count": 0}
+
+    class FakeResponse:
+        status_code = 200
+        content = b'{"choices": [{"message": {"content": "{\\"sentiment_score\\": 5}"}}]}'
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_exc):
+            return False
+
+        def json(self):
+            return {"choices": [{"message": {"content": "{\"sentiment_score\": 5}"}}]}
+
+    class FakeSession:
+        def post(self, *_args, **_kwargs):
+            calls["count"] += 1
+            return FakeResponse()
+
+    monkeypatch.setattr("marketsense.llm_client._get_session", lambda: FakeSession())
+
+    client = LLMClient(settings)
+    first = client._call_llm("sys", "user")
+    second = client._call_llm("sys", "user")
+
+    assert first == second
+    assert calls["count"] == 1
+
+
+def test_llm_client_near_duplicate_analysis_cache(monkeypatch):
+    monkeypatch.setenv("FIREBASE_STORAGE_BUCKET", "bucket")
+    monkeypatch.setenv("OLLAMA_API_KEY", "dummy")
+    monkeypatch.setenv("LLM_PROVIDER", "ollama")
+    settings = Settings.from_env()
+
+    client = LLMClient(settings)
+    calls = {"count": 0}
+
+    def fake_call_llm(_system, _user):
+        calls["count"] += 1
+        return {"sentiment_score": 6, "sentiment_summary": "ok", "key_discussions": [], "buying_intent": "中"}
+
+    monkeypatch.setattr(client, "_call_llm", fake_call_llm)
+
+    first = client.analyze("Great phone, posted 2024-01-01 10:00")
+    second = client.analyze("Great   phone, posted 2026-09-01 23:59")
+
+    assert first == second
+    assert calls["count"] == 1
@@ -1,4 +1,4 @@
-from marketsense.reporting import summarize_tasks, task_rows
+from marketsense.reporting import TASK_FIELDS, summarize_tasks, task_rows
 
 
 def test_summarize_tasks_basic():
@@ -28,6 +28,8 @@ def test_summarize_tasks_basic():
 
 
 def test_task_rows_shape():
-    rows = task_rows([{"url": "https://example.com", "status": "downloaded"}])
-    assert rows[0]["url"] == "https://example.com"
-    assert rows[0]["status"] == "downloaded"
+    rows = list(task_rows([{"url": "https://example.com", "status": "downloaded"}]))
+    row = dict(zip(TASK_FIELDS, rows[0]))
+    assert len(rows[0]) == len(TASK_FIELDS)
+    assert row["url"] == "https://example.com"
+    assert row["status"] == "downloaded"
@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+import functools
 import json
-from typing import Any, Dict, List, Optional
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - stdlib json fallback
+    _loads = json.loads
 
 try:
     from firebase_admin import firestore
@@ -14,26 +24,43 @@ except ImportError:  # pragma: no cover
 from .config import Settings
 from .firebase_client import get_db_and_bucket
 from .llm_client import LLMClient
+from .robots import RobotsCache, domain_from_url
+from .task_queue import BATCH_WRITE_LIMIT
 from .url_search import search_urls
 from .url_validator import validate_urls
 
 
+_JSON_OBJ_RE = re.compile(r"\{[\s\S]*\}")
+
+
 def _extract_json(text: str) -> Dict[str, Any]:
     try:
-        return json.loads(text)
+        return _loads(text)
     except Exception:
         pass
-    import re
 
-    match = re.search(r"\{[\s\S]*\}", text)
+    match = _JSON_OBJ_RE.search(text)
     if not match:
         return {}
     try:
-        return json.loads(match.group(0))
+        return _loads(match.group(0))
     except Exception:
         return {}
 
 
+# Mock/dry-run plans only vary by brand and product; cache the rendered
+# template as tuples (immutable, safe to share) and hand each caller
+# fresh lists so nobody mutates across calls. Test suites hit this path
+# constantly.
+@functools.lru_cache(maxsize=512)
+def _mock_plan(brand: str, product: str) -> Dict[str, tuple]:
+    return {
+        "search_queries": (f"{brand} {product}", f"{product} 評價", f"{product} 香氛皂"),
+        "platform_categories": ("官方網站", "電商", "社群", "論壇", "媒體"),
+        "keywords": (brand, product, "香氛皂", "手工皂", "療癒"),
+    }
+
+
 def generate_url_plan(
     client: LLMClient,
     brand: str,
@@ -42,11 +69,7 @@ def generate_url_plan(
     report: Dict[str, Any],
 ) -> Dict[str, Any]:
     if client.dry_run or client.settings.llm_provider.lower() == "mock":
-        return {
-            "search_queries": [f"{brand} {product}", f"{product} 評價", f"{product} 香氛皂"],
-            "platform_categories": ["官方網站", "電商", "社群", "論壇", "媒體"],
-            "keywords": [brand, product, "香氛皂", "手工皂", "療癒"],
-        }
+        return {key: list(values) for key, values in _mock_plan(brand, product).items()}
 
     prompt = (
         "請根據以下報告，產出可用於搜尋 URL 的規劃，輸出 JSON：\n"
@@ -68,27 +91,35 @@ def build_url_plan(
     manual_urls: Optional[List[str]] = None,
     auto_search: bool = False,
     limit_per_query: int = 10,
+    total_limit: Optional[int] = None,
 ) -> Dict[str, Any]:
     client = LLMClient(settings)
-    plan = generate_url_plan(client, brand, product, objective, report)
+    robots_cache = RobotsCache(settings)
+
+    # The LLM plan call and robots warmup for manual URLs are independent
+    # I/O; overlap them so wall clock pays for the slower of the two
+    # instead of their sum. The warmed cache feeds validate_urls below.
+    warm_domains: List[str] = []
+    if manual_urls and settings.robots_enabled:
+        warm_domains = [d for d in dict.fromkeys(domain_from_url(u) for u in manual_urls) if d]
+
+    with ThreadPoolExecutor(max_workers=min(16, 1 + len(warm_domains))) as executor:
+        plan_future = executor.submit(generate_url_plan, client, brand, product, objective, report)
+        for domain in warm_domains:
+            executor.submit(robots_cache.ensure_loaded, domain)
+        plan = plan_future.result()
 
     urls: List[str] = []
     if manual_urls:
         urls.extend(manual_urls)
     if auto_search:
         queries = plan.get("search_queries", [])
-        urls.extend(search_urls(queries, limit_per_query))
+        urls.extend(search_urls(queries, limit_per_query, total_limit=total_limit))
 
-    # dedupe
-    deduped = []
-    seen = set()
-    for url in urls:
-        if url in seen:
-            continue
-        seen.add(url)
-        deduped.append(url)
+    # dedupe preserving first occurrence, done at C level
+    deduped = list(dict.fromkeys(urls))
 
-    allowed, rejected = validate_urls(deduped, settings)
+    allowed, rejected = validate_urls(deduped, settings, robots_cache=robots_cache)
 
     return {
         "brand": brand,
@@ -108,3 +139,38 @@ def save_url_plan(settings: Settings, payload: Dict[str, Any]) -> None:
             "created_at": firestore.SERVER_TIMESTAMP,
         }
     )
+
+
+def save_url_plans(settings: Settings, payloads: Iterable[Dict[str, Any]]) -> int:
+    """Persist many plans in bulk instead of one add() round trip each.
+
+    Prefers the client's BulkWriter, which coalesces and parallelizes
+    the creates; falls back to WriteBatch chunks, then per-doc adds for
+    minimal clients.
+    """
+    payloads = list(payloads)
+    if not payloads:
+        return 0
+
+    db, _ = get_db_and_bucket(settings)
+    collection = db.collection("url_plans")
+    stamped = [{**payload, "created_at": firestore.SERVER_TIMESTAMP} for payload in payloads]
+
+    if hasattr(db, "bulk_writer"):
+        writer = db.bulk_writer()
+        for doc in stamped:
+            writer.create(collection.document(), doc)
+        writer.close()
+        return len(stamped)
+
+    if hasattr(db, "batch"):
+        for start in range(0, len(stamped), BATCH_WRITE_LIMIT):
+            batch = db.batch()
+            for doc in stamped[start : start + BATCH_WRITE_LIMIT]:
+                batch.set(collection.document(), doc)
+            batch.commit()
+        return len(stamped)
+
+    for doc in stamped:
+        collection.add(doc)
+    return len(stamped)
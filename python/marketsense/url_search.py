@@ -1,27 +1,51 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
+try:
+    import httpx
+except ImportError:  # pragma: no cover - thread-pool fallback
+    httpx = None
+try:
+    import ijson
+except ImportError:  # pragma: no cover - full-parse fallback
+    ijson = None
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
 
-def search_with_serpapi(query: str, limit: int = 10) -> List[str]:
-    api_key = os.getenv("SERPAPI_KEY")
-    if not api_key:
-        return []
 
-    engine = os.getenv("SERPAPI_ENGINE", "google")
-    params = {
-        "engine": engine,
-        "q": query,
-        "api_key": api_key,
-        "num": limit,
-    }
-    resp = requests.get("https://serpapi.com/search.json", params=params, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Shared keep-alive session for SerpAPI calls.
 
+    Every search hits the same host, so a pooled session pays the TLS
+    handshake once instead of per query.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+                session.mount("https://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def _extract_links(data: Dict[str, Any]) -> List[str]:
     urls = []
     for item in data.get("organic_results", []):
         link = item.get("link")
@@ -30,16 +54,174 @@ def search_with_serpapi(query: str, limit: int = 10) -> List[str]:
     return urls
 
 
-def search_urls(queries: List[str], limit_per_query: int = 10) -> List[str]:
-    urls: List[str] = []
+def _search_params(query: str, limit: int, api_key: str) -> Dict[str, Any]:
+    return {
+        "engine": os.getenv("SERPAPI_ENGINE", "google"),
+        "q": query,
+        "api_key": api_key,
+        "num": limit,
+    }
+
+
+def search_with_serpapi(query: str, limit: int = 10) -> List[str]:
+    api_key = os.getenv("SERPAPI_KEY")
+    if not api_key:
+        return []
+
+    params = _search_params(query, limit, api_key)
+
+    # SerpAPI responses carry hundreds of KB of metadata per query but
+    # only the organic result links matter here; with ijson installed
+    # they stream out of the socket without materializing the full dict,
+    # and parsing stops as soon as limit links are collected.
+    if ijson is not None:
+        resp = _get_session().get(
+            "https://serpapi.com/search.json", params=params, timeout=30, stream=True
+        )
+        try:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            urls = []
+            for link in ijson.items(resp.raw, "organic_results.item.link"):
+                if link:
+                    urls.append(link)
+                    if len(urls) >= limit:
+                        break
+            return urls
+        finally:
+            resp.close()
+
+    resp = _get_session().get("https://serpapi.com/search.json", params=params, timeout=30)
+    resp.raise_for_status()
+    data = orjson.loads(resp.content) if orjson is not None else resp.json()
+    return _extract_links(data)
+
+
+def _search_async(queries: List[str], limit: int, api_key: str) -> List[List[str]]:
+    """Submit all queries with async=true, then poll the Search Archive.
+
+    Submission returns immediately with a search id while SerpAPI
+    renders the SERPs in parallel on its side; polling with backoff then
+    collects them, so N queries cost roughly one SERP render instead of
+    N. Results come back in query order; searches that never complete
+    within the deadline yield empty lists.
+    """
+    session = _get_session()
+    ids: List[Optional[str]] = []
     for query in queries:
-        urls.extend(search_with_serpapi(query, limit_per_query))
-    # dedupe
-    seen = set()
-    deduped = []
-    for url in urls:
-        if url in seen:
-            continue
-        seen.add(url)
-        deduped.append(url)
-    return deduped
+        params = _search_params(query, limit, api_key)
+        params["async"] = "true"
+        try:
+            resp = session.get("https://serpapi.com/search.json", params=params, timeout=30)
+            resp.raise_for_status()
+            data = orjson.loads(resp.content) if orjson is not None else resp.json()
+            ids.append(data.get("search_metadata", {}).get("id"))
+        except Exception:
+            ids.append(None)
+
+    results: Dict[int, List[str]] = {}
+    pending = {index: search_id for index, search_id in enumerate(ids) if search_id}
+    delay = 1.0
+    deadline = time.monotonic() + 120
+    while pending and time.monotonic() < deadline:
+        time.sleep(delay)
+        for index, search_id in list(pending.items()):
+            try:
+                resp = session.get(
+                    f"https://serpapi.com/searches/{search_id}.json",
+                    params={"api_key": api_key},
+                    timeout=30,
+                )
+                resp.raise_for_status()
+                data = orjson.loads(resp.content) if orjson is not None else resp.json()
+            except Exception:
+                continue
+            status = data.get("search_metadata", {}).get("status", "")
+            if status == "Success":
+                results[index] = _extract_links(data)
+                del pending[index]
+            elif status == "Error":
+                results[index] = []
+                del pending[index]
+        delay = min(delay * 2, 8.0)
+
+    return [results.get(index, []) for index in range(len(queries))]
+
+
+async def _gather_httpx(queries: List[str], limit: int, api_key: str) -> List[List[str]]:
+    """Fan queries out over one multiplexed httpx client.
+
+    With the h2 extra installed the requests share a single HTTP/2
+    connection to SerpAPI instead of one socket per worker thread;
+    otherwise they still overlap over pooled HTTP/1.1 connections.
+    """
+    try:
+        client = httpx.AsyncClient(
+            http2=True, timeout=30, limits=httpx.Limits(max_connections=32)
+        )
+    except ImportError:  # h2 not installed
+        client = httpx.AsyncClient(timeout=30, limits=httpx.Limits(max_connections=32))
+
+    async with client:
+
+        async def _one(query: str) -> List[str]:
+            try:
+                resp = await client.get(
+                    "https://serpapi.com/search.json",
+                    params=_search_params(query, limit, api_key),
+                )
+                resp.raise_for_status()
+                data = orjson.loads(resp.content) if orjson is not None else resp.json()
+                return _extract_links(data)
+            except Exception:
+                return []
+
+        return list(await asyncio.gather(*[_one(query) for query in queries]))
+
+
+def search_urls(
+    queries: List[str],
+    limit_per_query: int = 10,
+    async_mode: bool = False,
+    total_limit: Optional[int] = None,
+) -> List[str]:
+    # Each SERP call mostly waits on the network; fan the queries out so
+    # wall clock tracks the slowest query instead of their sum. Results
+    # fold in query order, keeping the dedupe deterministic, and a
+    # total_limit stops consuming (and cancels unstarted queries) once
+    # enough distinct URLs have accumulated.
+    api_key = os.getenv("SERPAPI_KEY")
+    collected: Dict[str, None] = {}
+
+    def _take(result: List[str]) -> bool:
+        """Fold one query's links in; True once the global cap is hit."""
+        for url in result:
+            collected.setdefault(url, None)
+        return total_limit is not None and len(collected) >= total_limit
+
+    if async_mode and api_key and len(queries) > 1:
+        for result in _search_async(queries, limit_per_query, api_key):
+            if _take(result):
+                break
+    elif httpx is not None and api_key and len(queries) > 1:
+        for result in asyncio.run(_gather_httpx(queries, limit_per_query, api_key)):
+            if _take(result):
+                break
+    elif len(queries) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as executor:
+            futures = [
+                executor.submit(search_with_serpapi, query, limit_per_query)
+                for query in queries
+            ]
+            for index, future in enumerate(futures):
+                if _take(future.result()):
+                    for pending in futures[index + 1 :]:
+                        pending.cancel()
+                    break
+    else:
+        for query in queries:
+            if _take(search_with_serpapi(query, limit_per_query)):
+                break
+
+    urls = list(collected)
+    return urls[:total_limit] if total_limit is not None else urls
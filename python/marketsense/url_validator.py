@@ -1,18 +1,56 @@
 from __future__ import annotations
 
-from typing import Dict, List, Tuple
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
 from .config import Settings
-from .robots import RobotsCache, is_domain_allowed
+from .robots import RobotsCache, domain_from_url
 
 
-def validate_urls(urls: List[str], settings: Settings) -> Tuple[List[str], List[Dict[str, str]]]:
-    robots_cache = RobotsCache(settings)
+# Settings is a frozen (hashable) dataclass, so identical configurations
+# share one RobotsCache across validate_urls calls; a long-running
+# planner keeps its robots.txt knowledge between batches instead of
+# re-fetching every file each time.
+@functools.lru_cache(maxsize=4)
+def _shared_robots_cache(settings: Settings) -> RobotsCache:
+    return RobotsCache(settings)
+
+
+def validate_urls(
+    urls: List[str],
+    settings: Settings,
+    robots_cache: Optional[RobotsCache] = None,
+) -> Tuple[List[str], List[Dict[str, str]]]:
+    # Callers that warmed a cache earlier in their pipeline can pass it
+    # in so the prefetched parsers are reused here.
+    if robots_cache is None:
+        robots_cache = _shared_robots_cache(settings)
     allowed: List[str] = []
     rejected: List[Dict[str, str]] = []
 
-    for url in urls:
-        if not is_domain_allowed(url, settings.allow_domains, settings.deny_domains):
+    # Parse each URL's domain once and check membership inline against
+    # the frozensets Settings already holds, rather than paying an
+    # is_domain_allowed call (with its defensive set coercion) per URL.
+    allow = settings.allow_domains
+    deny = settings.deny_domains
+    domains = [domain_from_url(url) for url in urls]
+    domain_ok = [
+        not (deny and domain in deny) and (not allow or domain in allow)
+        for domain in domains
+    ]
+
+    # Warm robots.txt for every distinct domain up front so the fetches
+    # overlap instead of happening one by one inside the validation
+    # loop; the per-URL allowed() calls then hit the cache.
+    if settings.robots_enabled:
+        wanted = {domain for domain, ok in zip(domains, domain_ok) if ok and domain}
+        if len(wanted) > 1:
+            with ThreadPoolExecutor(max_workers=min(16, len(wanted))) as executor:
+                list(executor.map(robots_cache.ensure_loaded, wanted))
+
+    for url, ok in zip(urls, domain_ok):
+        if not ok:
             rejected.append({"url": url, "reason": "domain_not_allowed"})
             continue
         if settings.robots_enabled and not robots_cache.allowed(url):